@@ -1,6 +1,9 @@
+import atexit
+
 from django.apps import AppConfig
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save
 
 
 def create_superuser(sender, **kwargs):
@@ -24,3 +27,40 @@ class AuthappConfig(AppConfig):
     # 마이그레이션 후 자동으로 슈퍼유저를 생성하도록 ready 메서드에 신호 연결
     def ready(self):
         post_migrate.connect(create_superuser, sender=self)
+
+        from allauth.account.models import EmailAddress
+        from django.contrib.auth.signals import user_logged_in
+
+        from .blacklist_filter import add_to_blacklist_filter
+        from .cache import invalidate_user_cache
+        from .last_login import buffer_last_login, last_login_buffer
+        from .signals import (
+            record_email_verification,
+            record_token_revocation,
+            record_user_changes,
+            remember_email_verified,
+            token_blacklisted,
+        )
+
+        # 유저 정보 변경/삭제 시 certificate 유저 캐시 무효화
+        User = get_user_model()
+        post_save.connect(invalidate_user_cache, sender=User)
+        post_delete.connect(invalidate_user_cache, sender=User)
+
+        # 토큰 블랙리스트 추가, 유저 비활성화 시 폐기 이벤트 기록
+        token_blacklisted.connect(record_token_revocation)
+        token_blacklisted.connect(add_to_blacklist_filter)
+
+        # 유저 생성/이메일 변경/활성 상태 변경/이메일 인증 시 변경 이벤트 기록
+        post_save.connect(record_user_changes, sender=User)
+        post_init.connect(remember_email_verified, sender=EmailAddress)
+        post_save.connect(record_email_verification, sender=EmailAddress)
+
+        # 로그인마다 last_login을 UPDATE하지 않고 모아서 저장, 종료 시 남은 값 저장
+        if settings.LAST_LOGIN_BUFFER:
+            user_logged_in.disconnect(dispatch_uid="update_last_login")
+            user_logged_in.connect(buffer_last_login, dispatch_uid="update_last_login")
+            atexit.register(last_login_buffer.flush)
+
+        # drf-spectacular 인증 스키마 확장 등록, 설정 시스템 체크 등록
+        from . import checks, schema  # noqa: F401
@@ -0,0 +1,196 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import IssuedToken, jti_to_bytes
+
+
+class BloomFilter:
+    """바이트열 집합에 대한 Bloom filter (없으면 확실히 없음, 있으면 있을 수도 있음)"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # 목표 오탐률에 맞는 비트 수, 해시 함수 수
+        self.num_bits = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # 128비트 해시 하나를 둘로 나눠 k개의 위치 생성 (double hashing)
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def estimated_false_positive_rate(self):
+        return (
+            1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+        ) ** self.num_hashes
+
+
+class BlacklistFilter:
+    """
+    refresh token 블랙리스트 확인 전에 사용하는 프로세스 단위 필터.
+    필터에 없는 jti는 DB 조회 없이 블랙리스트가 아닌 것으로 판단하고,
+    필터에 있는 jti만 issued_token 테이블에서 다시 확인한다.
+    다른 워커에서 추가된 블랙리스트는 BLACKLIST_FILTER_SYNC_INTERVAL마다 가져온다.
+    """
+
+    def __init__(self):
+        self.bloom = None
+        self.capacity = settings.BLACKLIST_FILTER_CAPACITY
+        self.synced_at = None
+        self.next_sync = 0
+        self.negatives = 0
+        self.db_checks = 0
+        self.false_positives = 0
+        # 다음 sync의 여유 시간 안에 있는 jti (다시 조회되어도 중복으로 추가하지 않음)
+        self._recent = {}
+        self._lock = threading.Lock()
+
+    def _add(self, jti, blacklisted_at):
+        if jti in self._recent:
+            return
+        self.bloom.add(jti)
+        self._recent[jti] = blacklisted_at
+
+    def rebuild(self):
+        # 아직 만료되지 않은 블랙리스트 jti로 필터를 새로 만듦
+        synced_at = timezone.now()
+        recent_after = synced_at - timedelta(
+            seconds=settings.BLACKLIST_FILTER_SYNC_MARGIN
+        )
+        rows = IssuedToken.objects.filter(
+            blacklisted_at__isnull=False, expires_at__gt=synced_at
+        ).values_list("jti", "blacklisted_at")
+
+        bloom = BloomFilter(self.capacity, settings.BLACKLIST_FILTER_ERROR_RATE)
+        recent = {}
+        for jti, blacklisted_at in rows.iterator(chunk_size=10000):
+            jti = bytes(jti)
+            bloom.add(jti)
+            if blacklisted_at >= recent_after:
+                recent[jti] = blacklisted_at
+
+        self.bloom = bloom
+        self._recent = recent
+        self.synced_at = synced_at
+
+    def sync(self):
+        # 마지막 동기화 이후 추가된 블랙리스트 반영 (늦게 커밋된 행을 위해 여유 시간을 둠)
+        synced_at = timezone.now()
+        margin = timedelta(seconds=settings.BLACKLIST_FILTER_SYNC_MARGIN)
+        rows = IssuedToken.objects.filter(
+            blacklisted_at__gte=self.synced_at - margin
+        ).values_list("jti", "blacklisted_at")
+
+        for jti, blacklisted_at in rows:
+            self._add(bytes(jti), blacklisted_at)
+        self.synced_at = synced_at
+
+        # 다음 sync에서 다시 조회되지 않는 jti는 제거
+        recent_after = synced_at - margin
+        self._recent = {
+            jti: blacklisted_at
+            for jti, blacklisted_at in self._recent.items()
+            if blacklisted_at >= recent_after
+        }
+
+    def sync_if_due(self):
+        """필요하면 동기화하고 현재 필터 반환"""
+        now = time.monotonic()
+        bloom = self.bloom
+        if bloom is not None and now < self.next_sync:
+            return bloom
+
+        with self._lock:
+            if self.bloom is not None and now < self.next_sync:
+                return self.bloom
+
+            # 예상보다 많이 추가되어 오탐률이 높아지면 더 큰 필터로 다시 생성
+            if self.bloom is not None and self.bloom.count > self.capacity:
+                self.capacity *= 2
+                self.bloom = None
+
+            if self.bloom is None:
+                self.rebuild()
+            else:
+                self.sync()
+            self.next_sync = now + settings.BLACKLIST_FILTER_SYNC_INTERVAL
+            return self.bloom
+
+    def add(self, jti):
+        with self._lock:
+            if self.bloom is not None:
+                self._add(jti_to_bytes(jti), timezone.now())
+
+    def is_blacklisted(self, jti):
+        # reset()이 self.bloom을 비워도 이번 확인은 받아 온 필터로 처리
+        bloom = self.sync_if_due()
+
+        jti = jti_to_bytes(jti)
+        if jti not in bloom:
+            self.negatives += 1
+            return False
+
+        self.db_checks += 1
+        if IssuedToken.objects.filter(jti=jti, blacklisted_at__isnull=False).exists():
+            return True
+
+        self.false_positives += 1
+        return False
+
+    def reset(self):
+        with self._lock:
+            self.bloom = None
+            self._recent = {}
+            self.next_sync = 0
+
+    def stats(self):
+        bloom = self.bloom
+        checks = self.negatives + self.db_checks
+        return {
+            "items": bloom.count if bloom else 0,
+            "capacity": self.capacity,
+            "num_bits": bloom.num_bits if bloom else 0,
+            "num_hashes": bloom.num_hashes if bloom else 0,
+            "memory_bytes": len(bloom.bits) if bloom else 0,
+            "estimated_false_positive_rate": (
+                bloom.estimated_false_positive_rate if bloom else 0.0
+            ),
+            "checks": checks,
+            "db_checks": self.db_checks,
+            "false_positives": self.false_positives,
+            "observed_false_positive_rate": (
+                self.false_positives / checks if checks else 0.0
+            ),
+        }
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def add_to_blacklist_filter(sender, jti, **kwargs):
+    # 이 프로세스에서 추가된 블랙리스트는 바로 필터에 반영
+    blacklist_filter.add(jti)
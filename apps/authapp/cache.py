@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class TTLCache:
+    """프로세스 단위로 동작하는 크기 제한 + 만료 시간(TTL) 캐시"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[1] <= now:
+                # 없거나 만료된 항목은 miss로 처리
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            # 최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class SingleFlight:
+    """같은 키에 대한 동시 요청을 하나의 실행으로 합쳐 결과를 공유"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        # 먼저 시작한 요청의 결과를 기다렸다가 그대로 사용
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+# /auth/certificate 응답에 필요한 유저 필드만 캐시
+USER_CACHE_FIELDS = ("id", "email", "is_staff", "is_active", "token_version")
+
+user_cache = TTLCache(
+    max_size=settings.AUTH_USER_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL,
+)
+
+
+# 검증이 끝난 access token 캐시 (키: 원본 토큰의 sha256, 만료: 토큰의 exp)
+token_cache = TTLCache(
+    max_size=settings.AUTH_TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds(),
+)
+token_validation = SingleFlight()
+
+# /.well-known/jwks.json 응답 본문 캐시 (교체된 키가 만료되면 목록에서 빠지도록 TTL 적용)
+jwks_cache = TTLCache(max_size=1, ttl=settings.JWKS_CACHE_MAX_AGE)
+
+
+def invalidate_user_cache(sender, instance, **kwargs):
+    # 유저 정보가 바뀌거나 삭제되면 이 프로세스의 캐시에서 제거
+    user_cache.delete(instance.pk)
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from rest_framework_simplejwt import settings as simplejwt_settings
+
+
+@register(Tags.security)
+def check_embed_user_claims(app_configs, **kwargs):
+    # 클레임 모드는 access token이 짧게 유지될 때만 허용
+    if not settings.JWT_EMBED_USER_CLAIMS:
+        return []
+
+    # SIMPLE_JWT가 바뀌면 api_settings 객체가 교체되므로 모듈에서 읽음
+    access_lifetime = simplejwt_settings.api_settings.ACCESS_TOKEN_LIFETIME
+    max_lifetime = settings.JWT_EMBED_USER_CLAIMS_MAX_ACCESS_LIFETIME
+    if access_lifetime <= max_lifetime:
+        return []
+
+    return [
+        Error(
+            "JWT_EMBED_USER_CLAIMS requires ACCESS_TOKEN_LIFETIME "
+            f"of at most {max_lifetime}.",
+            hint="Shorten SIMPLE_JWT ACCESS_TOKEN_LIFETIME "
+            "or disable JWT_EMBED_USER_CLAIMS.",
+            id="authapp.E001",
+        )
+    ]
+
+
+@register(Tags.security)
+def check_google_id_token_audiences(app_configs, **kwargs):
+    # aud 목록이 비어 있으면 모든 구글 ID token 로그인이 거부됨
+    if settings.GOOGLE_ID_TOKEN_AUDIENCES:
+        return []
+
+    return [
+        Error(
+            "GOOGLE_ID_TOKEN_AUDIENCES is empty, so every Google login is rejected.",
+            hint="Set GOOGLE_ID_TOKEN_AUDIENCES to the Google OAuth client IDs.",
+            id="authapp.E002",
+        )
+    ]
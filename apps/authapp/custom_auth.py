@@ -1,16 +1,208 @@
+import hashlib
+import time
+
+from allauth.account.models import EmailAddress
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.db.models import Exists, OuterRef
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import USER_CACHE_FIELDS, token_cache, token_validation, user_cache
+from .hashing import hash_dummy_password, verify_password
+from .tokens import (
+    REFRESH_JTI_CLAIM,
+    TOKEN_VERSION_CLAIM,
+    is_refresh_token_blacklisted,
+    is_token_version_current,
+)
 
 User = get_user_model()
 
 
+def get_user_fields(user_ids):
+    """
+    user_id 목록에 대한 USER_CACHE_FIELDS 값을 {user_id: fields} 형태로 반환.
+    캐시에 없는 유저만 id__in 쿼리 한 번으로 조회해서 캐시에 채운다.
+    """
+    found = {}
+    missing = []
+    for user_id in set(user_ids):
+        fields = user_cache.get(user_id)
+        if fields is None:
+            missing.append(user_id)
+        else:
+            found[user_id] = fields
+
+    if missing:
+        for fields in User.objects.filter(
+            **{f"{api_settings.USER_ID_FIELD}__in": missing}
+        ).values(*USER_CACHE_FIELDS):
+            user_id = fields[api_settings.USER_ID_FIELD]
+            user_cache.set(user_id, fields)
+            found[user_id] = fields
+
+    return found
+
+
+def get_certificate_max_age(validated_token):
+    # 토큰 만료까지 남은 시간, AUTH_CERTIFICATE_MAX_AGE를 넘지 않음
+    return min(
+        max(int(validated_token["exp"] - time.time()), 0),
+        settings.AUTH_CERTIFICATE_MAX_AGE,
+    )
+
+
+def has_user_claims(validated_token):
+    return "email" in validated_token and "authorization" in validated_token
+
+
+def get_claims_user_fields(validated_token):
+    """
+    토큰에 email, authorization 클레임이 있으면 USER_CACHE_FIELDS 값을 만들어 반환.
+    해당 토큰을 발급한 refresh token이 블랙리스트에 있으면 AuthenticationFailed.
+    is_active, token_version은 유저 캐시에 있으면 캐시 값을 사용하고, 없으면 User를
+    조회하지 않으므로 비활성화/전체 로그아웃이 늦게 반영될 수 있다.
+    이 지연은 JWT_EMBED_USER_CLAIMS_MAX_ACCESS_LIFETIME 이하로 제한된다 (checks.py).
+    """
+    if not has_user_claims(validated_token):
+        return None
+
+    refresh_jti = validated_token.get(REFRESH_JTI_CLAIM)
+    if refresh_jti is None or is_refresh_token_blacklisted(refresh_jti):
+        raise AuthenticationFailed(_("Token is blacklisted"), code="token_not_valid")
+
+    user_id = validated_token[api_settings.USER_ID_CLAIM]
+    cached = user_cache.get(user_id) or {}
+    return {
+        "id": user_id,
+        "email": validated_token["email"],
+        "is_staff": validated_token["authorization"] == "admin",
+        "is_active": cached.get("is_active", True),
+        "token_version": cached.get(
+            "token_version", validated_token.get(TOKEN_VERSION_CLAIM, 0)
+        ),
+    }
+
+
+def get_token_user_fields(validated_token, users=None):
+    """
+    토큰의 유저 필드를 클레임 또는 유저 캐시/DB에서 찾아 반환.
+    유저가 없거나 비활성/폐기된 토큰이면 AuthenticationFailed.
+    users는 get_user_fields로 미리 조회한 {user_id: fields} (일괄 검증용)
+    """
+    try:
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    fields = get_claims_user_fields(validated_token)
+    if fields is None:
+        if users is None:
+            users = get_user_fields([user_id])
+        fields = users.get(user_id)
+    if fields is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    if not fields["is_active"]:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    check_token_version(validated_token, fields["token_version"])
+    return fields
+
+
+def check_token_version(validated_token, token_version):
+    if not is_token_version_current(validated_token, token_version):
+        raise AuthenticationFailed(_("Token has been revoked"), code="token_not_valid")
+
+
+def get_login_user(request, email):
+    """
+    로그인할 유저와 대표 이메일 인증 여부(email_unverified)를 쿼리 한 번으로 조회.
+    결과를 request에 저장해서 로그인 뷰, 시리얼라이저, 인증 백엔드가 재사용한다.
+    """
+    cached = getattr(request, "_login_user", None)
+    if cached is not None and cached[0] == email:
+        return cached[1]
+
+    user = None
+    if email:
+        user = (
+            User.objects.annotate(
+                email_unverified=Exists(
+                    EmailAddress.objects.filter(
+                        user=OuterRef("pk"), primary=True, verified=False
+                    )
+                )
+            )
+            .filter(email=email)
+            .first()
+        )
+
+    if request is not None:
+        request._login_user = (email, user)
+    return user
+
+
 class EmailBackend(ModelBackend):
     def authenticate(self, request, email=None, password=None, **kwargs):
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
+        # 관리자 페이지 등 username으로 로그인하는 경우는 ModelBackend에서 처리
+        if email is None:
             return None
 
-        if user.check_password(password):
+        # 해시 계산은 크기가 제한된 실행기에서 처리, 포화 상태면 503
+        user = get_login_user(request, email)
+        if user is None:
+            hash_dummy_password(password)
+        elif verify_password(user, password) and self.user_can_authenticate(user):
             return user
-        return None
+
+        # 같은 이메일로 ModelBackend가 다시 조회, 해시 계산하지 않도록 중단
+        raise PermissionDenied
+
+
+class VersionedJWTAuthentication(JWTAuthentication):
+    # 전체 로그아웃(token_version 증가) 이전에 발급된 토큰 거부
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        check_token_version(validated_token, user.token_version)
+        return user
+
+
+class CachedJWTAuthentication(VersionedJWTAuthentication):
+    """
+    토큰 검증 결과와 유저 정보를 프로세스 캐시에서 먼저 찾는 JWT 인증 클래스.
+    같은 토큰은 exp 시각까지 서명/클레임 검증을 다시 하지 않고,
+    유저는 캐시에 없을 때만 필요한 필드(USER_CACHE_FIELDS)를 DB에서 읽어온다.
+    """
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).digest()
+        validated_token = token_cache.get(key)
+        if validated_token is not None:
+            return validated_token
+
+        # 같은 토큰에 대한 동시 miss는 한 번만 검증
+        return token_validation.do(
+            key, lambda: self._validate_and_cache(key, raw_token)
+        )
+
+    def _validate_and_cache(self, key, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+
+        # 검증에 성공한 토큰만 exp 시각까지 캐시
+        ttl = validated_token["exp"] - time.time()
+        if ttl > 0:
+            token_cache.set(key, validated_token, ttl=ttl)
+        return validated_token
+
+    def get_user(self, validated_token):
+        # 비밀번호 변경 검사는 password 필드가 필요하므로 기본 동작 사용
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        # 캐시된 필드로만 구성한 User 인스턴스 (저장 용도로 사용하지 않음)
+        return User(**get_token_user_fields(validated_token))
@@ -0,0 +1,77 @@
+import threading
+
+import dns.exception
+import dns.resolver
+from django.conf import settings
+from django.core.cache import caches
+
+from .cache import SingleFlight
+
+
+class MXLookupCache:
+    """
+    회원가입 이메일 도메인의 MX 조회 결과 캐시.
+    결과는 워커 프로세스끼리 공유하는 "email_domains" 캐시(파일 캐시)에 저장하며,
+    MX 레코드가 있으면 레코드 TTL(최대 MX_CACHE_MAX_TTL초) 동안,
+    NXDOMAIN/NoAnswer는 MX_CACHE_NEGATIVE_TTL초 동안 재사용한다.
+    MX_PRELOADED_DOMAINS의 도메인은 조회하지 않고 바로 유효로 처리한다.
+    """
+
+    def __init__(self):
+        self.preloaded = 0
+        self.hits = 0
+        self.misses = 0
+        self.timeouts = 0
+        self._lookups = SingleFlight()
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def is_valid(self, domain):
+        domain = domain.strip().lower().rstrip(".")
+        if domain in settings.MX_PRELOADED_DOMAINS:
+            self._count("preloaded")
+            return True
+
+        cache = caches["email_domains"]
+        key = f"mx:{domain}"
+        valid = cache.get(key)
+        if valid is not None:
+            self._count("hits")
+            return valid
+
+        self._count("misses")
+        # 같은 도메인을 동시에 조회하는 요청은 이 워커에서 한 번만 조회
+        return self._lookups.do(domain, lambda: self._resolve(cache, key, domain))
+
+    def _resolve(self, cache, key, domain):
+        try:
+            answer = dns.resolver.resolve(
+                domain, "MX", lifetime=settings.MX_LOOKUP_TIMEOUT
+            )
+        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+            cache.set(key, False, settings.MX_CACHE_NEGATIVE_TTL)
+            return False
+        except (dns.exception.Timeout, dns.resolver.NoNameservers):
+            # 리졸버 장애로 가입을 막지 않도록 유효로 처리하고 캐시하지 않음
+            self._count("timeouts")
+            return True
+
+        ttl = min(answer.rrset.ttl, settings.MX_CACHE_MAX_TTL)
+        if ttl > 0:
+            cache.set(key, True, ttl)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "preloaded": self.preloaded,
+                "hits": self.hits,
+                "misses": self.misses,
+                "timeouts": self.timeouts,
+            }
+
+
+mx_cache = MXLookupCache()
@@ -0,0 +1,125 @@
+import hashlib
+import json
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework.exceptions import APIException, NotAuthenticated
+
+from .custom_auth import CachedJWTAuthentication, get_certificate_max_age
+
+authenticator = CachedJWTAuthentication()
+
+STATUS_LINES = {
+    status: f"{status.value} {status.phrase}"
+    for status in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED, HTTPStatus.UNAUTHORIZED)
+}
+JSON_HEADERS = [("Content-Type", "application/json")]
+
+
+def encode_json(data):
+    # DRF JSONRenderer와 같은 형태 (401 응답)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encode_certificate(data):
+    # UserAuthenticationView의 JsonResponse와 같은 바이트, ETag가 두 경로에서 같아야 함
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def etag_matches(etag, if_none_match):
+    # get_conditional_response와 같은 약한 비교 (W/ 무시, "*"는 모두 일치)
+    etags = parse_etags(if_none_match or "")
+    if etags == ["*"]:
+        return True
+    return etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in etags]
+
+
+def error_response(exc):
+    # DRF exception_handler와 같은 형태의 401 응답
+    if isinstance(exc.detail, (list, dict)):
+        data = exc.detail
+    else:
+        data = {"detail": exc.detail}
+
+    headers = JSON_HEADERS + [
+        ("WWW-Authenticate", authenticator.authenticate_header(None))
+    ]
+    return HTTPStatus.UNAUTHORIZED, headers, encode_json(data)
+
+
+def certify(authorization, if_none_match=None):
+    """
+    Authorization 헤더 값으로 UserAuthenticationView와 같은 응답을 만든다.
+    (status, headers, body) 형태로 반환
+    """
+    try:
+        raw_token = None
+        if authorization:
+            raw_token = authenticator.get_raw_token(
+                authorization.encode(HTTP_HEADER_ENCODING)
+            )
+        if raw_token is None:
+            raise NotAuthenticated()
+
+        validated_token = authenticator.get_validated_token(raw_token)
+        user = authenticator.get_user(validated_token)
+    except APIException as exc:
+        return error_response(exc)
+
+    body = encode_certificate(
+        {
+            "user_id": user.id,
+            "email": user.email,
+            "authentication": True,
+            "authorization": "admin" if user.is_staff else "general",
+        }
+    )
+    etag = quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+    headers = [
+        (
+            "Cache-Control",
+            f"private, max-age={get_certificate_max_age(validated_token)}",
+        ),
+        ("Vary", "Authorization"),
+        ("ETag", etag),
+    ]
+
+    if etag_matches(etag, if_none_match):
+        return HTTPStatus.NOT_MODIFIED, headers, b""
+    return HTTPStatus.OK, JSON_HEADERS + headers, body
+
+
+class CertificateFastPathApp:
+    """
+    GET /auth/certificate 요청을 Django 미들웨어와 DRF를 거치지 않고 바로 처리하는 WSGI 앱.
+    그 외 요청은 기존 Django WSGI 앱으로 넘긴다.
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self.path = settings.AUTH_CERTIFICATE_FAST_PATH
+
+    def __call__(self, environ, start_response):
+        if (
+            environ.get("PATH_INFO") != self.path
+            or environ.get("REQUEST_METHOD") != "GET"
+        ):
+            return self.application(environ, start_response)
+
+        # Django 요청 처리와 동일하게 요청 전후로 오래된 DB 연결 정리
+        close_old_connections()
+        try:
+            status, headers, body = certify(
+                environ.get("HTTP_AUTHORIZATION"), environ.get("HTTP_IF_NONE_MATCH")
+            )
+        finally:
+            close_old_connections()
+
+        start_response(
+            STATUS_LINES[status], headers + [("Content-Length", str(len(body)))]
+        )
+        return [body]
@@ -0,0 +1,136 @@
+import re
+import threading
+import time
+
+import jwt
+import requests
+import sentry_sdk
+from django.conf import settings
+
+from .cache import SingleFlight
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+
+def fetch_google_jwks():
+    """Google 공개키 목록과 Cache-Control max-age(초)를 반환"""
+    response = requests.get(GOOGLE_JWKS_URL, timeout=settings.GOOGLE_JWKS_TIMEOUT)
+    response.raise_for_status()
+
+    match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+    max_age = int(match.group(1)) if match else 0
+    return response.json(), max_age
+
+
+class GoogleKeySet:
+    """
+    Google ID token 서명 검증용 공개키를 프로세스 메모리에 캐시.
+    Cache-Control max-age가 지나면 다시 가져오고, 모르는 kid의 토큰이 오면
+    (키 교체) GOOGLE_JWKS_MIN_REFRESH_INTERVAL초에 한 번까지 다시 가져온다.
+    fetch는 (jwks dict, max_age)를 반환하는 함수로, 테스트에서는 로컬 키로 교체한다.
+    """
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.refreshes = 0
+        self.failures = 0
+        self._keys = {}
+        self._expires_at = 0.0
+        self._fetched_at = None
+        self._refresh = SingleFlight()
+        self._lock = threading.Lock()
+
+    def get_key(self, kid):
+        now = time.monotonic()
+        with self._lock:
+            key = self._keys.get(kid)
+            expired = now >= self._expires_at
+            can_refresh = (
+                self._fetched_at is None
+                or now - self._fetched_at >= settings.GOOGLE_JWKS_MIN_REFRESH_INTERVAL
+            )
+
+        if expired or (key is None and can_refresh):
+            # 같은 워커에서 동시에 만료된 요청은 한 번만 가져옴
+            self._refresh.do("jwks", self._load)
+            with self._lock:
+                key = self._keys.get(kid)
+        return key
+
+    def _load(self):
+        try:
+            jwks, max_age = self.fetch()
+            keys = {
+                key.key_id: key.key
+                for key in jwt.PyJWKSet.from_dict(jwks).keys
+                if key.key_id
+            }
+        except (
+            requests.RequestException,
+            jwt.PyJWKError,
+            jwt.PyJWKSetError,
+            ValueError,
+        ) as e:
+            # 가져오지 못하면 기존 키를 계속 사용하고 잠시 뒤 다시 시도
+            sentry_sdk.capture_exception(e)
+            with self._lock:
+                self.failures += 1
+                self._fetched_at = time.monotonic()
+                self._expires_at = (
+                    self._fetched_at + settings.GOOGLE_JWKS_MIN_REFRESH_INTERVAL
+                )
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + max_age
+            self.refreshes += 1
+
+    def reset(self):
+        with self._lock:
+            self._keys = {}
+            self._expires_at = 0.0
+            self._fetched_at = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "keys": len(self._keys),
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+                "expires_in": max(self._expires_at - time.monotonic(), 0),
+            }
+
+
+google_keys = GoogleKeySet(fetch=fetch_google_jwks)
+
+
+def verify_google_id_token(id_token):
+    """
+    Google ID token의 서명, 발급자(iss), 대상(aud), 만료(exp)를 이 프로세스에서 검증하고 클레임 반환.
+    유효하지 않으면 ValueError
+    """
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+    except jwt.InvalidTokenError:
+        raise ValueError("토큰이 유효하지 않습니다.")
+
+    key = google_keys.get_key(kid)
+    if key is None:
+        raise ValueError("토큰이 유효하지 않습니다.")
+
+    try:
+        return jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_ID_TOKEN_AUDIENCES,
+            issuer=GOOGLE_ISSUERS,
+            leeway=settings.GOOGLE_ID_TOKEN_LEEWAY,
+            options={"require": ["exp", "iat", "iss", "aud"]},
+        )
+    except jwt.InvalidTokenError:
+        raise ValueError("토큰이 유효하지 않습니다.")
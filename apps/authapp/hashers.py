@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+def tuned_param(hasher_class, name):
+    """settings.PASSWORD_HASHER_PARAMS[algorithm][name]이 있으면 그 값, 없으면 Django 기본값"""
+    default = getattr(hasher_class, name)
+
+    def get(self):
+        return settings.PASSWORD_HASHER_PARAMS.get(self.algorithm, {}).get(
+            name, default
+        )
+
+    return property(get)
+
+
+# 알고리즘 이름은 Django 해셔와 같으므로 기존 해시를 그대로 검증하고,
+# 비용 파라미터가 설정과 다르면 다음 로그인 때 새 파라미터로 다시 해시된다 (must_update)
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = tuned_param(PBKDF2PasswordHasher, "iterations")
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    # Argon2id, argon2-cffi 패키지가 설치되어 있어야 사용 가능
+    time_cost = tuned_param(Argon2PasswordHasher, "time_cost")
+    memory_cost = tuned_param(Argon2PasswordHasher, "memory_cost")
+    parallelism = tuned_param(Argon2PasswordHasher, "parallelism")
@@ -0,0 +1,220 @@
+import fcntl
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _(
+        "요청이 많아 로그인을 처리할 수 없습니다. 잠시 후 다시 시도해 주세요."
+    )
+    default_code = "password_hashing_unavailable"
+
+
+class SharedSlots:
+    """
+    한 서버의 gunicorn 워커들이 함께 사용하는 슬롯.
+    슬롯마다 "{PASSWORD_HASH_SLOTS_PATH}.{번호}" 파일 하나를 flock으로 점유하고,
+    프로세스가 종료되면 커널이 flock을 풀어 주므로 죽은 워커의 슬롯도 반환된다.
+    """
+
+    def __init__(self):
+        self._pid = None
+        self._path = None
+        self._fds = []
+        self._held = set()
+        self._lock = threading.Lock()
+
+    def _open(self, path, size):
+        # fork된 워커마다 파일을 따로 열어야 flock이 프로세스 간에 동작함
+        if self._pid == os.getpid() and self._path == path and len(self._fds) == size:
+            return
+
+        if self._pid == os.getpid():
+            for fd in self._fds:
+                os.close(fd)
+        self._fds = [
+            os.open(f"{path}.{index}", os.O_RDWR | os.O_CREAT, 0o600)
+            for index in range(size)
+        ]
+        self._held = set()
+        self._path = path
+        self._pid = os.getpid()
+
+    def acquire(self, path, size):
+        """비어 있는 슬롯 번호를 점유해서 반환, 모두 사용 중이면 None"""
+        with self._lock:
+            self._open(path, size)
+            for index, fd in enumerate(self._fds):
+                # 같은 프로세스의 다른 스레드가 점유한 슬롯은 flock이 다시 성공하므로 건너뜀
+                if index in self._held:
+                    continue
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                self._held.add(index)
+                return index
+        return None
+
+    def release(self, index):
+        with self._lock:
+            fcntl.flock(self._fds[index], fcntl.LOCK_UN)
+            self._held.discard(index)
+
+
+class HashingExecutor:
+    """
+    비밀번호 해시 계산을 크기가 제한된 스레드 풀에서 실행 (hashlib.pbkdf2_hmac은 GIL을 놓음).
+    실행 중인 작업과 대기 작업이 PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE를 넘거나
+    PASSWORD_HASH_DEADLINE초 안에 끝나지 않으면 기다리지 않고 503으로 거부한다.
+    PASSWORD_HASH_WORKERS가 0이면 요청 스레드에서 바로 실행한다.
+    sync 워커는 프로세스마다 요청을 하나씩만 처리하므로, 서버 전체의 동시 해시 계산 수는
+    PASSWORD_HASH_MAX_CONCURRENT(워커 간 공유 슬롯)로 제한한다.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._shared = SharedSlots()
+        self._lock = threading.Lock()
+        self.depth = 0
+        self.max_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _get_executor(self):
+        # gunicorn이 fork한 뒤 워커 프로세스에서 처음 사용할 때 스레드 생성
+        with self._lock:
+            if self._executor is None:
+                workers = settings.PASSWORD_HASH_WORKERS
+                self._slots = threading.BoundedSemaphore(
+                    workers + settings.PASSWORD_HASH_QUEUE_SIZE
+                )
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    def _acquire_shared(self):
+        # 공유 슬롯 번호 반환, 제한이 없으면 None, 모두 사용 중이면 503
+        if not settings.PASSWORD_HASH_MAX_CONCURRENT:
+            return None
+
+        index = self._shared.acquire(
+            settings.PASSWORD_HASH_SLOTS_PATH, settings.PASSWORD_HASH_MAX_CONCURRENT
+        )
+        if index is None:
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingUnavailable()
+        return index
+
+    def _release_shared(self, index):
+        if index is not None:
+            self._shared.release(index)
+
+    def run(self, func, *args):
+        shared_slot = self._acquire_shared()
+        if not settings.PASSWORD_HASH_WORKERS:
+            try:
+                return func(*args)
+            finally:
+                self._release_shared(shared_slot)
+
+        executor = self._get_executor()
+        if not self._slots.acquire(blocking=False):
+            self._release_shared(shared_slot)
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingUnavailable()
+
+        with self._lock:
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+
+        future = executor.submit(self._call, time.monotonic(), func, args)
+        # 취소된 작업도 슬롯을 돌려받도록 완료 콜백에서 정리
+        future.add_done_callback(lambda future: self._release(future, shared_slot))
+
+        try:
+            return future.result(timeout=settings.PASSWORD_HASH_DEADLINE)
+        except FutureTimeoutError:
+            # 아직 대기 중이면 취소, 이미 실행 중이면 끝날 때까지 슬롯 점유
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordHashingUnavailable()
+
+    def _call(self, submitted_at, func, args):
+        wait = time.monotonic() - submitted_at
+        with self._lock:
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+        return func(*args)
+
+    def _release(self, future, shared_slot):
+        with self._lock:
+            self.depth -= 1
+            if not future.cancelled():
+                self.completed += 1
+        self._slots.release()
+        self._release_shared(shared_slot)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "queue_size": settings.PASSWORD_HASH_QUEUE_SIZE,
+                "max_concurrent": settings.PASSWORD_HASH_MAX_CONCURRENT,
+                "depth": self.depth,
+                "max_depth": self.max_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": (
+                    self.wait_total / self.completed * 1000 if self.completed else 0.0
+                ),
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+password_hasher = HashingExecutor()
+
+
+def verify_password(user, password):
+    """
+    user.check_password와 같지만 해시 계산은 password_hasher에서 실행.
+    해시 알고리즘/반복 횟수가 바뀐 경우의 재해시 저장은 요청 스레드에서 처리하고,
+    슬롯이 부족하면 건너뛰고 다음 로그인에서 다시 시도한다.
+    """
+    needs_update = []
+    is_correct = password_hasher.run(
+        check_password, password, user.password, needs_update.append
+    )
+
+    if needs_update:
+        try:
+            user.password = password_hasher.run(make_password, password)
+        except PasswordHashingUnavailable:
+            # 비밀번호는 이미 확인되었으므로 재해시 때문에 로그인을 거부하지 않음
+            return is_correct
+        user.save(update_fields=["password"])
+    return is_correct
+
+
+def hash_dummy_password(password):
+    # 없는 유저도 비밀번호 해시를 한 번 계산해서 응답 시간 차이를 줄임
+    password_hasher.run(make_password, password)
@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+
+import sentry_sdk
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+
+class LastLoginBuffer:
+    """
+    로그인 시각을 프로세스 메모리에 모았다가 bulk UPDATE 한 번으로 저장.
+    LAST_LOGIN_FLUSH_SIZE명이 모이면 바로, 그렇지 않으면 LAST_LOGIN_FLUSH_INTERVAL초마다
+    백그라운드 스레드에서 저장하고, 워커가 종료될 때 남은 값을 저장한다.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.last_flush = time.monotonic()
+        self.flushes = 0
+        self._flusher_pid = None
+        self._lock = threading.Lock()
+
+    def add(self, user_id, logged_in_at=None):
+        with self._lock:
+            self.pending[user_id] = logged_in_at or timezone.now()
+            due = (
+                len(self.pending) >= settings.LAST_LOGIN_FLUSH_SIZE
+                or time.monotonic() - self.last_flush
+                >= settings.LAST_LOGIN_FLUSH_INTERVAL
+            )
+            self._start_flusher()
+
+        if due:
+            self.flush()
+
+    def _start_flusher(self):
+        # fork 이전 스레드는 워커에 복사되지 않으므로 프로세스마다 처음 add할 때 시작
+        if self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+        threading.Thread(
+            target=self._run_flusher, name="last-login-flush", daemon=True
+        ).start()
+
+    def _run_flusher(self):
+        # 로그인이 더 없어도 마지막 flush 후 LAST_LOGIN_FLUSH_INTERVAL초가 지나면 저장
+        while True:
+            with self._lock:
+                wait = (
+                    self.last_flush
+                    + settings.LAST_LOGIN_FLUSH_INTERVAL
+                    - time.monotonic()
+                )
+            if wait > 0:
+                time.sleep(wait)
+                continue
+
+            try:
+                self.flush()
+            finally:
+                # 이 스레드의 DB 연결은 요청 처리 후처럼 정리되지 않으므로 매번 닫음
+                connection.close()
+
+    def flush(self):
+        with self._lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+        if not pending:
+            return
+
+        User = get_user_model()
+        try:
+            # 유저마다 다른 시각을 CASE WHEN으로 한 번에 UPDATE (post_save 신호 없음)
+            User.objects.bulk_update(
+                [
+                    User(pk=user_id, last_login=logged_in_at)
+                    for user_id, logged_in_at in pending.items()
+                ],
+                ["last_login"],
+                batch_size=settings.LAST_LOGIN_FLUSH_SIZE,
+            )
+            self.flushes += 1
+        except Exception as e:
+            # 저장하지 못한 값은 다음 flush에서 다시 시도 (그 사이 더 최근 로그인 우선)
+            sentry_sdk.capture_exception(e)
+            with self._lock:
+                for user_id, logged_in_at in pending.items():
+                    self.pending.setdefault(user_id, logged_in_at)
+
+    def stats(self):
+        with self._lock:
+            return {"pending": len(self.pending), "flushes": self.flushes}
+
+
+last_login_buffer = LastLoginBuffer()
+
+
+def buffer_last_login(sender, user, **kwargs):
+    # django.contrib.auth.models.update_last_login 대신 연결되는 신호 핸들러
+    last_login_buffer.add(user.pk)
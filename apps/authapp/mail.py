@@ -0,0 +1,162 @@
+import base64
+import smtplib
+import time
+from collections import deque
+
+import sentry_sdk
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import QueuedEmail
+from .outbox import OutboxDispatcher, backoff_delay, pending_lag
+
+
+def serialize_message(message):
+    """EmailMessage를 JSON으로 저장할 수 있는 dict로 변환 (문자열/바이트 첨부 파일만 지원)"""
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise ValueError("MIMEBase attachments can't be queued")
+        filename, content, mimetype = attachment
+        if isinstance(content, bytes):
+            content = {"base64": base64.b64encode(content).decode("ascii")}
+        attachments.append([filename, content, mimetype])
+
+    return {
+        "subject": str(message.subject),
+        "body": str(message.body),
+        "content_subtype": message.content_subtype,
+        "from_email": message.from_email,
+        "to": message.to,
+        "cc": message.cc,
+        "bcc": message.bcc,
+        "reply_to": message.reply_to,
+        "headers": message.extra_headers,
+        "alternatives": [list(alt) for alt in getattr(message, "alternatives", [])],
+        "attachments": attachments,
+    }
+
+
+def deserialize_message(data):
+    message = EmailMultiAlternatives(
+        subject=data["subject"],
+        body=data["body"],
+        from_email=data["from_email"],
+        to=data["to"],
+        cc=data["cc"],
+        bcc=data["bcc"],
+        reply_to=data["reply_to"],
+        headers=data["headers"],
+        alternatives=[tuple(alt) for alt in data["alternatives"]],
+    )
+    message.content_subtype = data["content_subtype"]
+    for filename, content, mimetype in data["attachments"]:
+        if isinstance(content, dict):
+            content = base64.b64decode(content["base64"])
+        message.attach(filename, content, mimetype)
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    메일을 바로 보내지 않고 queued_email 테이블에 저장만 하는 백엔드 (INSERT 한 번).
+    발송은 send_queued_email 커맨드가 QUEUED_EMAIL_DELIVERY_BACKEND로 처리한다.
+    """
+
+    def send_messages(self, email_messages):
+        queued = [
+            QueuedEmail(message=serialize_message(message))
+            for message in email_messages
+            if message.recipients()
+        ]
+        try:
+            QueuedEmail.objects.bulk_create(queued)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(queued)
+
+
+def queue_lag():
+    """발송 대기 중인 메일 수와 가장 오래된 메일의 대기 시간(초)"""
+    return pending_lag(QueuedEmail)
+
+
+class MinuteRateLimiter:
+    """최근 60초 동안 보낸 메일이 rate개가 되면 가장 오래된 발송 후 60초까지 대기"""
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.clock = clock
+        self.sleep = sleep
+        self._sent = deque()
+
+    def wait(self):
+        if not self.rate:
+            return
+        now = self.clock()
+        while self._sent and now - self._sent[0] >= 60:
+            self._sent.popleft()
+        if len(self._sent) >= self.rate:
+            self.sleep(60 - (now - self._sent.popleft()))
+            now = self.clock()
+        self._sent.append(now)
+
+
+class MailDispatcher(OutboxDispatcher):
+    """
+    queued_email의 메일을 발송.
+    SMTP 연결은 배치 사이에도 열어 두고 재사용하며, 서버가 끊은 연결은 다시 연결해서 한 번 더 시도한다.
+    """
+
+    model = QueuedEmail
+
+    def __init__(self, connection=None, rate_limiter=None):
+        self.connection = connection or get_connection(
+            settings.QUEUED_EMAIL_DELIVERY_BACKEND, fail_silently=False
+        )
+        self.rate_limiter = rate_limiter or MinuteRateLimiter(
+            settings.QUEUED_EMAIL_RATE_PER_MINUTE
+        )
+
+    def send(self, message):
+        """성공하면 None, 실패하면 오류 메시지 반환"""
+        self.rate_limiter.wait()
+        for retry in (True, False):
+            try:
+                # 열려 있는 연결이 있으면 send_messages가 닫지 않고 재사용
+                self.connection.open()
+                self.connection.send_messages([message])
+                return None
+            except smtplib.SMTPServerDisconnected as e:
+                # 오래 쉬는 동안 서버가 끊은 연결
+                self.connection.close()
+                if not retry:
+                    return f"{type(e).__name__}: {e}"
+            except Exception as e:
+                self.connection.close()
+                return f"{type(e).__name__}: {e}"
+
+    def send_entry(self, entry):
+        return self.send(deserialize_message(entry.message))
+
+    def retry_delay(self, attempts):
+        return backoff_delay(
+            attempts,
+            settings.QUEUED_EMAIL_BASE_BACKOFF,
+            settings.QUEUED_EMAIL_MAX_BACKOFF,
+        )
+
+    def on_failure(self, entry, error):
+        # QUEUED_EMAIL_MAX_ATTEMPTS번 실패한 메일은 버림 (인증/재설정 링크는 곧 만료됨)
+        if entry.attempts < settings.QUEUED_EMAIL_MAX_ATTEMPTS:
+            return False
+        sentry_sdk.capture_message(
+            f"Dropped queued email {entry.pk} after {entry.attempts} attempts. {error}"
+        )
+        return True
+
+    def close(self):
+        self.connection.close()
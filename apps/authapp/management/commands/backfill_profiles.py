@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from allauth.account.models import EmailAddress
+from django.core.management.base import BaseCommand
+from requests.adapters import HTTPAdapter
+
+from ...models import ProfileOutbox
+from ...profile_outbox import ProfileDispatcher
+
+# 같은 유저는 다시 실행해도 같은 Idempotency-Key를 사용
+BACKFILL_NAMESPACE = uuid.UUID("6f1c7d2e-4f3b-4a8e-9b7a-2c5d8e1f0a34")
+
+
+def backfill_idempotency_key(user_id):
+    return uuid.uuid5(BACKFILL_NAMESPACE, str(user_id))
+
+
+class RateLimiter:
+    """여러 스레드의 요청을 초당 rate개 이하로 맞춤 (0이면 제한 없음)"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(self.next_at, now) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends a Spring profile creation request for every user with a verified "
+        "email, in user id order with bounded concurrency. Failed users are added "
+        "to the profile outbox for dispatch_profile_outbox to retry"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Users to read per query (default: 1000)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help="Concurrent requests to the profile service (default: 16)",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=500,
+            help="Maximum requests per second, 0 for no limit (default: 500)",
+        )
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            default=None,
+            help="Resume after this user id (default: the checkpoint file, or 0)",
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            default=None,
+            help="File to record the last finished user id in after every chunk",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the users that would be sent",
+        )
+
+    def read_checkpoint(self, path):
+        if path and os.path.exists(path):
+            with open(path) as f:
+                return int(f.read().strip() or 0)
+        return 0
+
+    def write_checkpoint(self, path, last_user_id):
+        if not path:
+            return
+        # 중간에 종료되어도 파일이 깨지지 않도록 임시 파일로 쓴 뒤 교체
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(last_user_id))
+        os.replace(tmp_path, path)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        concurrency = options["concurrency"]
+        checkpoint_file = options["checkpoint_file"]
+        dry_run = options["dry_run"]
+        last_user_id = options["start_after"]
+        if last_user_id is None:
+            last_user_id = self.read_checkpoint(checkpoint_file)
+
+        # 동시 요청 수만큼 keep-alive 연결을 유지
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        dispatcher = ProfileDispatcher(session)
+        limiter = RateLimiter(options["rate"])
+
+        def send(user_id):
+            limiter.wait()
+            error = dispatcher.create_profile(
+                user_id, backfill_idempotency_key(user_id)
+            )
+            return user_id, error
+
+        verified_user_ids = (
+            EmailAddress.objects.filter(verified=True)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+
+        started = time.monotonic()
+        total = failed_total = 0
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="profile-backfill"
+        ) as executor:
+            while True:
+                # user id 순서로 다음 청크를 읽음 (긴 쿼리나 전체 결과를 메모리에 올리지 않음)
+                user_ids = list(
+                    verified_user_ids.filter(user_id__gt=last_user_id)[:chunk_size]
+                )
+                if not user_ids:
+                    break
+
+                chunk_started = time.monotonic()
+                failed = []
+                if not dry_run:
+                    for user_id, error in executor.map(send, user_ids):
+                        if error is not None:
+                            failed.append(
+                                ProfileOutbox(
+                                    user_id=user_id,
+                                    idempotency_key=backfill_idempotency_key(user_id),
+                                    last_error=error,
+                                )
+                            )
+                    # 실패한 유저는 outbox에서 같은 키로 백오프 재시도
+                    # 이전 실행에서 이미 outbox에 넣은 유저는 기존 행을 유지
+                    ProfileOutbox.objects.bulk_create(failed, ignore_conflicts=True)
+
+                last_user_id = user_ids[-1]
+                total += len(user_ids)
+                failed_total += len(failed)
+                if not dry_run:
+                    self.write_checkpoint(checkpoint_file, last_user_id)
+
+                elapsed = time.monotonic() - chunk_started
+                self.stdout.write(
+                    f"last_user_id={last_user_id} users={len(user_ids)} "
+                    f"failed={len(failed)} "
+                    f"users/sec={len(user_ids) / max(elapsed, 1e-6):.0f}"
+                )
+
+                if len(user_ids) < chunk_size:
+                    break
+
+        elapsed = time.monotonic() - started
+        verb = "Would send" if dry_run else "Sent"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {total} profile requests in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-6):.0f} users/sec, {failed_total} queued "
+                f"for retry, last_user_id={last_user_id})"
+            )
+        )
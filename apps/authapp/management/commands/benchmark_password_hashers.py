@@ -0,0 +1,85 @@
+import statistics
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+# 해시 시간에 비례하는 파라미터 (PASSWORD_HASHER_PARAMS로 조정 가능한 값)
+TUNABLE_PARAMS = {"pbkdf2_sha256": "iterations", "argon2": "time_cost"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the configured PASSWORD_HASHERS on this machine and recommends "
+        "PASSWORD_HASHER_PARAMS for a target hashing time"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250,
+            help="Target time per password hash in milliseconds (default: 250)",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=5,
+            help="Hashes to time per hasher, the median is used (default: 5)",
+        )
+
+    def measure(self, hasher, samples):
+        timings = []
+        # 첫 실행은 라이브러리 로드 등이 포함되므로 제외
+        for _ in range(samples + 1):
+            started = time.perf_counter()
+            hasher.encode("benchmark-password", hasher.salt())
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings[1:]) * 1000
+
+    def recommend(self, hasher, measured_ms, target_ms):
+        param = TUNABLE_PARAMS.get(hasher.algorithm)
+        if param is None:
+            return None
+
+        # 해시 시간은 파라미터 값에 비례
+        current = getattr(hasher, param)
+        value = current * target_ms / measured_ms
+        if param == "iterations":
+            value = round(value, -3)
+        return param, max(int(round(value)), 1)
+
+    def handle(self, *args, **options):
+        target_ms = options["target_ms"]
+        params = {}
+
+        for index, hasher in enumerate(get_hashers()):
+            name = f"{hasher.algorithm} ({type(hasher).__name__})"
+            if index == 0:
+                name += " [default]"
+
+            try:
+                measured_ms = self.measure(hasher, options["samples"])
+            except ValueError as e:
+                # argon2-cffi, bcrypt 등 라이브러리가 설치되지 않은 해셔
+                self.stdout.write(f"{name}: skipped ({e})")
+                continue
+
+            self.stdout.write(
+                f"{name}: {measured_ms:.1f} ms/hash, "
+                f"{1000 / measured_ms:.1f} hashes/sec per core"
+            )
+
+            recommended = self.recommend(hasher, measured_ms, target_ms)
+            if recommended is not None:
+                param, value = recommended
+                params[hasher.algorithm] = {param: value}
+                self.stdout.write(
+                    f"  {param}: {getattr(hasher, param)} -> {value} "
+                    f"for ~{target_ms:.0f} ms"
+                )
+
+        if params:
+            self.stdout.write(
+                self.style.SUCCESS(f"PASSWORD_HASHER_PARAMS = {params!r}")
+            )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from ...profile_outbox import ProfileDispatcher, outbox_lag
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends queued Spring profile creation requests from the profile outbox "
+        "in batches, retrying failures with exponential backoff. "
+        "Rows being sent are locked, so several instances can run at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Outbox rows to send per batch (default: 100)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll for new rows instead of exiting when drained",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls with --loop (default: 1.0)",
+        )
+
+    def handle(self, *args, **options):
+        totals = {"sent": 0, "failed": 0}
+
+        def on_batch(stats):
+            totals["sent"] += stats["sent"]
+            totals["failed"] += stats["failed"]
+            lag = outbox_lag()
+            self.stdout.write(
+                f"sent={stats['sent']} failed={stats['failed']} "
+                f"lag_avg={stats['lag_avg']:.1f}s lag_max={stats['lag_max']:.1f}s "
+                f"pending={lag['pending']} oldest_age={lag['oldest_age']:.1f}s"
+            )
+
+        dispatcher = ProfileDispatcher()
+        dispatcher.run(
+            options["batch_size"],
+            poll_interval=options["poll_interval"] if options["loop"] else None,
+            on_batch=on_batch,
+        )
+
+        lag = outbox_lag()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {totals['sent']} profile requests, {totals['failed']} failed "
+                f"({lag['pending']} pending, oldest {lag['oldest_age']:.1f}s)"
+            )
+        )
@@ -0,0 +1,104 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from ...models import IssuedToken
+
+# issued: 현재 토큰 저장소, outstanding: 이전에 simplejwt가 저장한 토큰 (블랙리스트 포함)
+STORES = {"issued": IssuedToken, "outstanding": OutstandingToken}
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired issued tokens (or legacy simplejwt outstanding tokens "
+        "and their blacklist entries) in primary key order, a chunk at a time"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--store",
+            choices=STORES,
+            default="issued",
+            help="Token table to purge (default: issued)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows to delete per statement (default: 1000)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.5,
+            help="Seconds to wait between chunks (default: 0.5)",
+        )
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            default=0,
+            help="Resume from the last_pk printed by a previous run",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the rows that would be deleted",
+        )
+
+    def handle(self, *args, **options):
+        model = STORES[options["store"]]
+        chunk_size = options["chunk_size"]
+        dry_run = options["dry_run"]
+        last_pk = options["start_after"]
+
+        # 실행 중에 새로 만료되는 토큰은 다음 실행에서 삭제
+        expired = model.objects.filter(expires_at__lte=timezone.now())
+
+        started = time.monotonic()
+        total = 0
+
+        while True:
+            # 기본 키 순서로 다음 청크를 찾아 짧은 DELETE 여러 번으로 나눔 (락, 복제 지연 최소화)
+            pks = list(
+                expired.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                break
+
+            chunk_started = time.monotonic()
+            if dry_run:
+                deleted = len(pks)
+                if model is OutstandingToken:
+                    deleted += BlacklistedToken.objects.filter(token_id__in=pks).count()
+            else:
+                # 블랙리스트 행은 함께 삭제되고, 토큰 원문은 읽지 않음
+                deleted, _ = model.objects.filter(pk__in=pks).only("pk").delete()
+
+            last_pk = pks[-1]
+            total += deleted
+
+            elapsed = time.monotonic() - chunk_started
+            self.stdout.write(
+                f"last_pk={last_pk} rows={deleted} "
+                f"rows/sec={deleted / max(elapsed, 1e-6):.0f}"
+            )
+
+            if len(pks) < chunk_size:
+                break
+            time.sleep(options["sleep"])
+
+        elapsed = time.monotonic() - started
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {total} rows from {model._meta.db_table} in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-6):.0f} rows/sec, last_pk={last_pk})"
+            )
+        )
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from ...mail import MailDispatcher, queue_lag
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends email stored by QueuedEmailBackend in batches over one reused "
+        "connection, rate limited per minute, retrying failures with exponential "
+        "backoff. Run a single instance so the per-minute rate limit holds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Queued emails to send per batch (default: 50)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll for new email instead of exiting when drained",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls with --loop (default: 1.0)",
+        )
+
+    def handle(self, *args, **options):
+        totals = {"sent": 0, "failed": 0, "dropped": 0}
+
+        def on_batch(stats):
+            for key in totals:
+                totals[key] += stats[key]
+            lag = queue_lag()
+            self.stdout.write(
+                f"sent={stats['sent']} failed={stats['failed']} "
+                f"dropped={stats['dropped']} lag_avg={stats['lag_avg']:.1f}s "
+                f"lag_max={stats['lag_max']:.1f}s pending={lag['pending']} "
+                f"oldest_age={lag['oldest_age']:.1f}s"
+            )
+
+        MailDispatcher().run(
+            options["batch_size"],
+            poll_interval=options["poll_interval"] if options["loop"] else None,
+            on_batch=on_batch,
+        )
+
+        lag = queue_lag()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {totals['sent']} emails, {totals['failed']} failed, "
+                f"{totals['dropped']} dropped ({lag['pending']} pending, "
+                f"oldest {lag['oldest_age']:.1f}s)"
+            )
+        )
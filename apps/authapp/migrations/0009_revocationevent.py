@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authapp", "0008_delete_profile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RevocationEvent",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("token", "Token blacklisted"),
+                            ("user", "User deactivated"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("user_id", models.BigIntegerField(null=True)),
+                ("jti", models.CharField(max_length=255, null=True)),
+                ("expires_at", models.DateTimeField(null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "revocation_event",
+            },
+        ),
+    ]
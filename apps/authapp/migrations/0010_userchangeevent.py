@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-17 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authapp", "0009_revocationevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserChangeEvent",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("user_id", models.BigIntegerField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("verified", "Email verified"),
+                            ("email_changed", "Email changed"),
+                            ("deactivated", "Deactivated"),
+                            ("activated", "Activated"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("email", models.EmailField(max_length=254)),
+                ("is_active", models.BooleanField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "user_change_event",
+            },
+        ),
+    ]
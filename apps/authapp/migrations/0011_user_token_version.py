@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-17 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authapp", "0010_userchangeevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="revocationevent",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("token", "Token blacklisted"),
+                    ("user", "All user tokens revoked"),
+                ],
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2 on 2026-10-17 02:29
+
+import uuid
+
+from django.db import migrations, models
+from django.utils import timezone
+
+import apps.authapp.models
+
+
+def copy_blacklisted_tokens(apps, schema_editor):
+    # 아직 만료되지 않은 기존 블랙리스트를 issued_token으로 옮김
+    BlacklistedToken = apps.get_model("token_blacklist", "BlacklistedToken")
+    IssuedToken = apps.get_model("authapp", "IssuedToken")
+
+    rows = BlacklistedToken.objects.filter(
+        token__expires_at__gt=timezone.now()
+    ).values_list(
+        "token__jti",
+        "token__user_id",
+        "token__created_at",
+        "token__expires_at",
+        "blacklisted_at",
+    )
+    IssuedToken.objects.bulk_create(
+        (
+            IssuedToken(
+                jti=uuid.UUID(hex=jti).bytes,
+                user_id=user_id,
+                created_at=created_at,
+                expires_at=expires_at,
+                blacklisted_at=blacklisted_at,
+            )
+            for jti, user_id, created_at, expires_at, blacklisted_at in rows.iterator()
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authapp", "0011_user_token_version"),
+        ("token_blacklist", "0012_alter_outstandingtoken_user"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssuedToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("jti", apps.authapp.models.JTIField(max_length=16, unique=True)),
+                ("user_id", models.BigIntegerField(null=True)),
+                ("created_at", models.DateTimeField(null=True)),
+                ("expires_at", models.DateTimeField()),
+                ("blacklisted_at", models.DateTimeField(null=True)),
+            ],
+            options={
+                "db_table": "issued_token",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="issuedtoken",
+            index=models.Index(
+                fields=["blacklisted_at"], name="issued_toke_blackli_fd8fe2_idx"
+            ),
+        ),
+        migrations.RunPython(copy_blacklisted_tokens, migrations.RunPython.noop),
+    ]
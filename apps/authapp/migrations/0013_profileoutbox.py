@@ -0,0 +1,47 @@
+# Generated by Django 4.2 on 2026-10-17 02:41
+
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authapp", "0012_issuedtoken"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_id", models.BigIntegerField()),
+                ("idempotency_key", models.UUIDField(default=uuid.uuid4, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "db_table": "profile_outbox",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="profileoutbox",
+            index=models.Index(
+                fields=["next_attempt_at"], name="profile_out_next_at_4471b5_idx"
+            ),
+        ),
+    ]
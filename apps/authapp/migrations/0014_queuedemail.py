@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-17 02:44
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authapp", "0013_profileoutbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("message", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "db_table": "queued_email",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="queuedemail",
+            index=models.Index(
+                fields=["next_attempt_at"], name="queued_emai_next_at_ee4876_idx"
+            ),
+        ),
+    ]
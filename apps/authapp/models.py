@@ -1,5 +1,11 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import user_cache
 
 
 class CustomUserManager(BaseUserManager):
@@ -31,8 +37,183 @@ class User(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    # 증가시키면 이전 값이 담긴 토큰이 모두 무효화됨 (전체 로그아웃)
+    token_version = models.PositiveIntegerField(default=0)
+
     objects = CustomUserManager()
 
+    # 저장 시 변경 여부를 판단하기 위해 DB에서 읽은 값을 보관하는 필드
+    TRACKED_FIELDS = ("email", "is_active")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self):
+        self._loaded_values = {
+            field: self.__dict__[field]
+            for field in self.TRACKED_FIELDS
+            if field in self.__dict__
+        }
+
+    def revoke_tokens(self):
+        """
+        이 유저에게 발급된 모든 토큰을 무효화한다.
+        토큰 수와 관계없이 token_version을 증가시키는 UPDATE 한 번으로 처리
+        유저 캐시는 이 프로세스에서만 바로 지우므로 다른 워커에는
+        최대 AUTH_USER_CACHE_TTL초 뒤에 반영된다.
+        """
+        User.objects.filter(pk=self.pk).update(token_version=F("token_version") + 1)
+        self.token_version += 1
+
+        user_cache.delete(self.pk)
+        RevocationEvent.objects.create(kind=RevocationEvent.KIND_USER, user_id=self.pk)
+
+
+class RevocationEvent(models.Model):
+    """다른 서비스가 토큰 유효성 캐시를 동기화할 수 있도록 남기는 추가 전용 폐기 이벤트"""
+
+    KIND_TOKEN = "token"
+    KIND_USER = "user"
+    KIND_CHOICES = [
+        (KIND_TOKEN, "Token blacklisted"),
+        (KIND_USER, "All user tokens revoked"),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    user_id = models.BigIntegerField(null=True)
+    jti = models.CharField(max_length=255, null=True)
+    # 이 시각 이후에는 이벤트를 보관하지 않아도 됨 (토큰 만료 시각)
+    expires_at = models.DateTimeField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "revocation_event"
+
+
+def jti_to_bytes(jti):
+    # uuid4 hex 형태의 jti 문자열을 16바이트로 변환
+    return uuid.UUID(hex=jti).bytes
+
+
+class JTIField(models.BinaryField):
+    """jti를 16바이트로 저장하는 필드 (MySQL에서는 인덱스 가능한 binary(16))"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", 16)
+        super().__init__(*args, **kwargs)
+
+    def db_type(self, connection):
+        if connection.vendor == "mysql":
+            return f"binary({self.max_length})"
+        return super().db_type(connection)
+
+
+class IssuedToken(models.Model):
+    """
+    발급된 refresh token의 블랙리스트 확인에 필요한 값만 저장하는 테이블.
+    simplejwt OutstandingToken과 달리 토큰 원문을 저장하지 않는다.
+    """
+
+    jti = JTIField(unique=True)
+    user_id = models.BigIntegerField(null=True)
+    # 이 테이블이 생기기 전에 발급된 토큰은 블랙리스트 추가 시 발급 시각 없이 저장
+    created_at = models.DateTimeField(null=True)
+    expires_at = models.DateTimeField()
+    blacklisted_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "issued_token"
+        indexes = [models.Index(fields=["blacklisted_at"])]
+
+    @classmethod
+    def blacklist(cls, jti, user_id, expires_at):
+        """jti를 블랙리스트에 추가하고, 이번에 새로 추가되었으면 True 반환"""
+        now = timezone.now()
+        jti = jti_to_bytes(jti)
+
+        if cls.objects.filter(jti=jti, blacklisted_at__isnull=True).update(
+            blacklisted_at=now
+        ):
+            return True
+
+        _, created = cls.objects.get_or_create(
+            jti=jti,
+            defaults={
+                "user_id": user_id,
+                "expires_at": expires_at,
+                "blacklisted_at": now,
+            },
+        )
+        return created
+
+
+class UserChangeEvent(models.Model):
+    """다른 서비스가 유저 복제본을 동기화할 수 있도록 남기는 추가 전용 변경 이벤트"""
+
+    KIND_CREATED = "created"
+    KIND_VERIFIED = "verified"
+    KIND_EMAIL_CHANGED = "email_changed"
+    KIND_DEACTIVATED = "deactivated"
+    KIND_ACTIVATED = "activated"
+    KIND_CHOICES = [
+        (KIND_CREATED, "Created"),
+        (KIND_VERIFIED, "Email verified"),
+        (KIND_EMAIL_CHANGED, "Email changed"),
+        (KIND_DEACTIVATED, "Deactivated"),
+        (KIND_ACTIVATED, "Activated"),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    user_id = models.BigIntegerField()
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # 이벤트 시점의 유저 상태
+    email = models.EmailField()
+    is_active = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "user_change_event"
+
+
+class ProfileOutbox(models.Model):
+    """
+    spring 프로필 생성 요청을 유저 변경과 같은 트랜잭션에 기록하는 outbox.
+    dispatch_profile_outbox 커맨드가 전송에 성공한 행을 삭제한다.
+    """
+
+    user_id = models.BigIntegerField()
+    # spring에 Idempotency-Key 헤더로 전달, 재시도해도 같은 값을 사용
+    idempotency_key = models.UUIDField(default=uuid.uuid4, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    # 실패하면 지수 백오프로 다음 시도 시각을 늦춤
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "profile_outbox"
+        indexes = [models.Index(fields=["next_attempt_at"])]
+
+
+class QueuedEmail(models.Model):
+    """QueuedEmailBackend가 저장하고 send_queued_email 커맨드가 발송하는 메일"""
+
+    # EmailMessage를 다시 만들 수 있는 필드 (apps.authapp.mail.serialize_message)
+    message = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    # 실패하면 지수 백오프로 다음 시도 시각을 늦춤
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "queued_email"
+        indexes = [models.Index(fields=["next_attempt_at"])]
+
 
 class Category(models.Model):
     name = models.CharField(max_length=255)
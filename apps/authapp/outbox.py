@@ -0,0 +1,117 @@
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+
+def backoff_delay(attempts, base, maximum):
+    # base초, 2배, 4배 ... 최대 maximum초
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+def pending_lag(model):
+    """전송 대기 중인 행 수와 가장 오래된 행의 대기 시간(초)"""
+    pending = model.objects.aggregate(count=Count("pk"), oldest=Min("created_at"))
+    oldest = pending["oldest"]
+    return {
+        "pending": pending["count"],
+        "oldest_age": (timezone.now() - oldest).total_seconds() if oldest else 0.0,
+    }
+
+
+class OutboxDispatcher:
+    """
+    next_attempt_at이 지난 행을 배치로 가져와 전송하는 outbox 전송 기본 클래스.
+    하위 클래스는 model과 send_entry, retry_delay를 정의하고,
+    실패 처리(알림, 포기)는 on_failure에서, 연결 정리는 close에서 처리한다.
+    """
+
+    model = None
+
+    def send_entry(self, entry):
+        """성공하면 None, 실패하면 오류 메시지 반환"""
+        raise NotImplementedError
+
+    def retry_delay(self, attempts):
+        raise NotImplementedError
+
+    def on_failure(self, entry, error):
+        # True를 반환하면 다시 시도하지 않고 행을 삭제
+        return False
+
+    def close(self):
+        pass
+
+    def dispatch_batch(self, batch_size):
+        """
+        다음 시도 시각이 지난 행을 batch_size개까지 전송하고 결과 통계 반환.
+        전송했거나 포기한 행은 DELETE 한 번으로, 실패한 행은 bulk UPDATE 한 번으로 처리한다.
+        가져온 행은 처리가 끝날 때까지 잠가 두어 여러 인스턴스가 같은 행을 보내지 않는다.
+        """
+        with transaction.atomic():
+            return self._dispatch_batch(batch_size)
+
+    def _dispatch_batch(self, batch_size):
+        entries = list(
+            self.model.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=timezone.now())
+            .order_by("pk")[:batch_size]
+        )
+
+        done, failed, lags = [], [], []
+        dropped = 0
+        for entry in entries:
+            error = self.send_entry(entry)
+            if error is None:
+                done.append(entry.pk)
+                lags.append((timezone.now() - entry.created_at).total_seconds())
+                continue
+
+            entry.attempts += 1
+            entry.last_error = error
+            if self.on_failure(entry, error):
+                done.append(entry.pk)
+                dropped += 1
+                continue
+
+            entry.next_attempt_at = timezone.now() + timedelta(
+                seconds=self.retry_delay(entry.attempts)
+            )
+            failed.append(entry)
+
+        if done:
+            self.model.objects.filter(pk__in=done).delete()
+        if failed:
+            self.model.objects.bulk_update(
+                failed, ["attempts", "last_error", "next_attempt_at"]
+            )
+
+        return {
+            "fetched": len(entries),
+            "sent": len(lags),
+            "failed": len(failed),
+            "dropped": dropped,
+            "lag_max": max(lags, default=0.0),
+            "lag_avg": sum(lags) / len(lags) if lags else 0.0,
+        }
+
+    def run(self, batch_size, poll_interval=None, on_batch=None):
+        """
+        전송할 행이 없을 때까지 배치를 반복.
+        poll_interval이 있으면 종료하지 않고 그 간격으로 다시 확인한다.
+        """
+        try:
+            while True:
+                stats = self.dispatch_batch(batch_size)
+                if stats["fetched"] and on_batch is not None:
+                    on_batch(stats)
+
+                # 모두 실패했으면 백오프 시각 전까지 같은 행을 다시 가져오지 않으므로 대기
+                if stats["fetched"] < batch_size or not stats["sent"]:
+                    if poll_interval is None:
+                        return
+                    time.sleep(poll_interval)
+        finally:
+            self.close()
@@ -0,0 +1,23 @@
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class IsInternalService(BasePermission):
+    """
+    유저 JWT 없이 서비스 간 호출을 허용하는 권한 클래스.
+    X-Service-Token 헤더가 settings.INTERNAL_SERVICE_TOKENS 중 하나와 일치해야 한다.
+    """
+
+    message = "유효한 서비스 토큰이 필요합니다."
+
+    def has_permission(self, request, view):
+        token = request.headers.get("X-Service-Token", "").encode()
+        if not token:
+            return False
+
+        return any(
+            hmac.compare_digest(token, service_token.encode())
+            for service_token in settings.INTERNAL_SERVICE_TOKENS
+        )
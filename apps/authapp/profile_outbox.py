@@ -0,0 +1,69 @@
+import requests
+import sentry_sdk
+from django.conf import settings
+
+from .models import ProfileOutbox
+from .outbox import OutboxDispatcher, backoff_delay, pending_lag
+
+
+def enqueue_profile_creation(user_id):
+    """
+    spring 프로필 생성 요청을 outbox에 기록.
+    유저 생성/이메일 인증과 같은 트랜잭션 안에서 호출해야 함께 커밋되거나 롤백된다.
+    """
+    return ProfileOutbox.objects.create(user_id=user_id)
+
+
+def retry_delay(attempts):
+    # 5초, 10초, 20초 ... 최대 PROFILE_OUTBOX_MAX_BACKOFF초
+    return backoff_delay(
+        attempts,
+        settings.PROFILE_OUTBOX_BASE_BACKOFF,
+        settings.PROFILE_OUTBOX_MAX_BACKOFF,
+    )
+
+
+def outbox_lag():
+    """전송 대기 중인 요청 수와 가장 오래된 요청의 대기 시간(초)"""
+    return pending_lag(ProfileOutbox)
+
+
+class ProfileDispatcher(OutboxDispatcher):
+    """outbox의 프로필 생성 요청을 spring에 전송 (keep-alive 연결 재사용)"""
+
+    model = ProfileOutbox
+
+    def __init__(self, session=None):
+        self.session = session or requests.Session()
+
+    def send_entry(self, entry):
+        return self.create_profile(entry.user_id, entry.idempotency_key)
+
+    def create_profile(self, user_id, idempotency_key):
+        """성공하면 None, 실패하면 오류 메시지 반환"""
+        try:
+            response = self.session.post(
+                settings.PROFILE_SERVICE_URL,
+                json={"id": user_id},
+                headers={"Idempotency-Key": str(idempotency_key)},
+                timeout=settings.PROFILE_SERVICE_TIMEOUT,
+            )
+        except requests.RequestException as e:
+            return f"{type(e).__name__}: {e}"
+
+        # 409: 이미 생성된 프로필 (이전 시도가 응답 전에 끊긴 경우)
+        if response.status_code in (200, 201, 409):
+            return None
+        return f"Status code: {response.status_code}, Response: {response.text[:500]}"
+
+    def retry_delay(self, attempts):
+        return retry_delay(attempts)
+
+    def on_failure(self, entry, error):
+        # 계속 실패하는 요청만 알림 (spring 장애 중 반복 알림 방지)
+        if entry.attempts == settings.PROFILE_OUTBOX_ALERT_ATTEMPTS:
+            sentry_sdk.capture_message(
+                f"Failed to create profile in Spring server "
+                f"for user {entry.user_id} after {entry.attempts} attempts. {error}"
+            )
+        return False
@@ -0,0 +1,7 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class OurJWTScheme(SimpleJWTScheme):
+    # 검증 방식만 다른 JWT 인증 클래스도 같은 Bearer 스키마로 문서화
+    target_class = "apps.authapp.custom_auth.VersionedJWTAuthentication"
+    match_subclasses = True
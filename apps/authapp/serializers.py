@@ -1,13 +1,24 @@
 from allauth.account.adapter import get_adapter
-from allauth.account.utils import setup_user_email
+from allauth.account.models import EmailAddress
 from dj_rest_auth.registration.serializers import RegisterSerializer
 from dj_rest_auth.serializers import LoginSerializer
-from django.contrib.auth import authenticate, get_user_model
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 
-from .models import User
+from .custom_auth import get_login_user, get_user_fields
+from .models import RevocationEvent
+from .tokens import OurRefreshToken, is_token_version_current
 
 
 class CustomRegisterSerializer(RegisterSerializer):
@@ -20,12 +31,8 @@ class CustomRegisterSerializer(RegisterSerializer):
             self.fields.pop("username")
 
     def validate_email(self, value):
-        User = get_user_model()
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError(
-                {"error": "이미 사용 중인 이메일입니다"}, code=400
-            )
-        return value
+        # 중복 이메일은 조회하지 않고 save에서 unique 제약 위반(IntegrityError)으로 확인
+        return get_adapter().clean_email(value)
 
     def get_cleaned_data(self):
         return {
@@ -47,9 +54,20 @@ class CustomRegisterSerializer(RegisterSerializer):
                 raise serializers.ValidationError(
                     detail=serializers.as_serializer_error(exc)
                 )
-        user.save()
-        self.custom_signup(request, user)
-        setup_user_email(request, user, [])
+
+        # User, EmailAddress INSERT를 한 트랜잭션으로 처리
+        try:
+            with transaction.atomic():
+                user.save()
+                self.custom_signup(request, user)
+                email_address = EmailAddress.objects.create(
+                    user=user, email=user.email.lower(), primary=True, verified=False
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({"error": "이미 사용 중인 이메일입니다"})
+
+        # 확인 이메일 발송 시 EmailAddress를 다시 조회하지 않도록 캐시
+        EmailAddress.objects.fill_cache_for_user(user, [email_address])
         return user
 
 
@@ -63,13 +81,12 @@ class CustomLoginSerializer(LoginSerializer):
         password = attrs.get("password")
 
         if email and password:
-            user = authenticate(
-                request=self.context.get("request"), email=email, password=password
-            )
+            request = self.context.get("request")
+            user = authenticate(request=request, email=email, password=password)
 
             if not user:
-                # 사용자 객체가 없으면 자격 증명이 잘못된 것
-                if User.objects.filter(email=email).exists():
+                # 사용자 객체가 없으면 자격 증명이 잘못된 것 (인증 백엔드가 조회한 유저 재사용)
+                if get_login_user(request, email) is not None:
                     raise ValidationError({"error": _("올바르지 않은 비밀번호입니다.")})
                 else:
                     raise ValidationError(
@@ -82,6 +99,29 @@ class CustomLoginSerializer(LoginSerializer):
         return attrs
 
 
+class OurTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # 로그인 시 키링 백엔드로 서명하는 토큰 발급
+    token_class = OurRefreshToken
+
+
+class VersionedRefreshToken(OurRefreshToken):
+    def verify(self, *args, **kwargs):
+        # 전체 로그아웃, 비밀번호 재설정 이전에 발급된 refresh token 거부
+        # 서명 검증과 같은 디코드 결과를 사용하고, token_version은 유저 캐시에서 확인
+        super().verify(*args, **kwargs)
+
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        fields = get_user_fields([user_id]).get(user_id)
+        if fields is None or not is_token_version_current(
+            self, fields["token_version"]
+        ):
+            raise TokenError(_("Token has been revoked"))
+
+
+class OurTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = VersionedRefreshToken
+
+
 class UserSerializer(serializers.Serializer):
     pk = serializers.IntegerField()
     email = serializers.EmailField()
@@ -102,6 +142,68 @@ class UserCertificateSerializer(serializers.Serializer):
     )
 
 
+class CertificateBatchRequestSerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.AUTH_CERTIFICATE_BATCH_MAX_SIZE,
+    )
+
+
+class CertificateBatchResponseSerializer(serializers.Serializer):
+    # 요청한 tokens 순서대로 결과 반환, 실패한 토큰은 error 필드 포함
+    results = UserCertificateSerializer(many=True)
+
+
+class UserLookupRequestSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.USER_LOOKUP_MAX_SIZE,
+    )
+
+
+class UserLookupResponseSerializer(serializers.Serializer):
+    # 컬럼별 배열, 같은 인덱스가 한 유저
+    user_id = serializers.ListField(child=serializers.IntegerField())
+    email = serializers.ListField(child=serializers.EmailField())
+    authorization = serializers.ListField(child=serializers.CharField())
+    is_active = serializers.ListField(child=serializers.BooleanField())
+    # 존재하지 않는 유저 id
+    not_found = serializers.ListField(child=serializers.IntegerField())
+
+
+class RevocationFeedQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.REVOCATION_FEED_MAX_LIMIT,
+        default=settings.REVOCATION_FEED_MAX_LIMIT,
+    )
+
+
+class RevocationEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RevocationEvent
+        fields = ["seq", "kind", "user_id", "jti", "expires_at", "created_at"]
+
+
+class RevocationFeedSerializer(serializers.Serializer):
+    events = RevocationEventSerializer(many=True)
+    # 다음 요청의 since 값
+    next = serializers.IntegerField()
+    has_more = serializers.BooleanField()
+
+
+class UserChangeFeedQuerySerializer(serializers.Serializer):
+    after = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.USER_CHANGE_FEED_MAX_LIMIT,
+        default=settings.USER_CHANGE_FEED_MAX_LIMIT,
+    )
+
+
 class InvalidTokenResponseSerializer(serializers.Serializer):
     detail = serializers.CharField()
     code = serializers.CharField()
@@ -0,0 +1,63 @@
+from django.dispatch import Signal
+
+from .models import RevocationEvent, UserChangeEvent
+
+# refresh token이 블랙리스트에 새로 추가됨 (jti, user_id, expires_at)
+token_blacklisted = Signal()
+
+
+def record_token_revocation(sender, jti, user_id, expires_at, **kwargs):
+    # 로그아웃, refresh token 교체 등으로 블랙리스트에 추가된 토큰 기록
+    RevocationEvent.objects.create(
+        kind=RevocationEvent.KIND_TOKEN,
+        user_id=user_id,
+        jti=jti,
+        expires_at=expires_at,
+    )
+
+
+def record_user_change(user, kind):
+    UserChangeEvent.objects.create(
+        user_id=user.pk, kind=kind, email=user.email, is_active=user.is_active
+    )
+
+
+def record_user_changes(sender, instance, created, **kwargs):
+    # 유저 생성, 이메일 변경, 활성 상태 변경을 변경 이벤트로 기록
+    if created:
+        record_user_change(instance, UserChangeEvent.KIND_CREATED)
+        instance.remember_loaded_values()
+        return
+
+    # DB에서 읽지 않은 인스턴스는 이전 값을 알 수 없으므로 건너뜀
+    loaded = getattr(instance, "_loaded_values", {})
+
+    if "email" in loaded and loaded["email"] != instance.email:
+        record_user_change(instance, UserChangeEvent.KIND_EMAIL_CHANGED)
+
+    if "is_active" in loaded and loaded["is_active"] != instance.is_active:
+        if instance.is_active:
+            record_user_change(instance, UserChangeEvent.KIND_ACTIVATED)
+        else:
+            record_user_change(instance, UserChangeEvent.KIND_DEACTIVATED)
+            # 비활성화된 유저의 모든 토큰 무효화
+            instance.revoke_tokens()
+
+    instance.remember_loaded_values()
+
+
+def remember_email_verified(sender, instance, **kwargs):
+    instance._loaded_verified = instance.verified
+
+
+def record_email_verification(sender, instance, created, **kwargs):
+    # 이메일 인증이 완료된 시점을 변경 이벤트로 기록
+    if instance.verified and (created or not instance._loaded_verified):
+        UserChangeEvent.objects.create(
+            user_id=instance.user_id,
+            kind=UserChangeEvent.KIND_VERIFIED,
+            email=instance.email,
+            is_active=instance.user.is_active,
+        )
+
+    instance._loaded_verified = instance.verified
@@ -1,16 +1,83 @@
-from unittest.mock import patch
+import json
+import multiprocessing
+import os
+import smtplib
+import tempfile
+import threading
+import time
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
 
+import dns.resolver
+import jwt
+import requests
+from allauth.account.models import EmailAddress, EmailConfirmationHMAC
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.tokens import default_token_generator
+from django.contrib.sites.models import Site
 from django.core import mail
-from django.core.mail import send_mail
-from django.test import TestCase
+from django.core.mail import EmailMultiAlternatives, send_mail
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist_filter import BloomFilter, blacklist_filter
+from .cache import SingleFlight, token_cache, user_cache
+from .checks import check_embed_user_claims, check_google_id_token_audiences
+from .custom_auth import get_user_fields
+from .email_domain import MXLookupCache
+from .fast_certificate import CertificateFastPathApp
+from .google_auth import google_keys
+from .hashing import HashingExecutor, PasswordHashingUnavailable, password_hasher
+from .last_login import LastLoginBuffer, last_login_buffer
+from .mail import (
+    MailDispatcher,
+    MinuteRateLimiter,
+    deserialize_message,
+    serialize_message,
+)
+from .models import (
+    IssuedToken,
+    ProfileOutbox,
+    QueuedEmail,
+    RevocationEvent,
+    UserChangeEvent,
+    jti_to_bytes,
+)
+from .profile_outbox import ProfileDispatcher, retry_delay
+from .throttling import bucket_store
+from .tokens import OurRefreshToken, token_backend
+from .views import UserChangeFeedView
+
+# 다른 테스트가 로그인/회원가입 요청 수 제한에 걸리지 않도록 모듈 전체에서 제한을 끔
+# (ThrottleTest에서 다시 설정)
+no_throttle = override_settings(AUTH_THROTTLE_RATES={})
+
+
+def setUpModule():
+    no_throttle.enable()
+
+
+def tearDownModule():
+    no_throttle.disable()
 
 
 class PasswordResetRequestTest(APITestCase):
@@ -106,3 +173,1848 @@ class PasswordResetConfirmTest(APITestCase):
         response = self.client.post(url, pw_data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertIn("Invalid", response.data["error"])
+
+
+class UserCertificateCacheTest(APITestCase):
+    # certificate 유저 캐시 테스트 코드
+    def setUp(self):
+        user_cache.clear()
+        token_cache.clear()
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="cacheuser@naver.com", password="password123"
+        )
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + access_token)
+        self.url = reverse("auth")
+
+    def test_certificate_served_from_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 두 번째 요청부터는 User 테이블을 조회하지 않음
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["email"], "cacheuser@naver.com")
+        self.assertEqual(user_cache.stats()["hits"], 1)
+        self.assertEqual(user_cache.stats()["misses"], 1)
+
+    def test_cache_invalidated_on_user_save(self):
+        self.client.get(self.url)
+
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["authorization"], "admin")
+
+    def test_inactive_user_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_certificate_cache_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("max-age=30", response["Cache-Control"])
+        self.assertIn("Authorization", response["Vary"])
+
+        # 같은 ETag로 요청하면 본문 없이 304
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(AUTH_CERTIFICATE_MAX_AGE=0)
+    def test_certificate_max_age_cap(self):
+        response = self.client.get(self.url)
+        self.assertIn("max-age=0", response["Cache-Control"])
+
+    def test_validated_token_served_from_cache(self):
+        self.client.get(self.url)
+
+        # 같은 토큰은 다시 서명/클레임 검증을 하지 않음
+        with patch.object(
+            JWTAuthentication, "get_validated_token", side_effect=AssertionError
+        ):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_token_not_cached(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(token_cache.stats()["size"], 0)
+
+    def test_single_flight_collapses_concurrent_calls(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def validate():
+            calls.append(1)
+            time.sleep(0.1)
+            return "token"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(single_flight.do("key", validate))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["token"] * 5)
+
+
+class UserCertificateBatchTest(APITestCase):
+    # 여러 토큰 일괄 검증 테스트 코드
+    def setUp(self):
+        user_cache.clear()
+        token_cache.clear()
+        User = get_user_model()
+
+        self.users = [
+            User.objects.create_user(email=f"batch{i}@naver.com", password="pw")
+            for i in range(3)
+        ]
+        self.tokens = [
+            str(RefreshToken.for_user(user).access_token) for user in self.users
+        ]
+        self.url = reverse("auth-batch")
+
+    def test_batch_certificate(self):
+        tokens = self.tokens + ["invalid"]
+
+        # 유저 조회는 id__in 쿼리 한 번
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {"tokens": tokens}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 4)
+        self.assertEqual(
+            [result["user_id"] for result in results[:3]],
+            [user.id for user in self.users],
+        )
+        self.assertTrue(all(result["authentication"] for result in results[:3]))
+        self.assertFalse(results[3]["authentication"])
+
+    def test_batch_requires_tokens(self):
+        response = self.client.post(self.url, {"tokens": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+def generate_private_key_pem(private_key):
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+class SigningKeyRotationTest(APITestCase):
+    # 비대칭 서명 키, JWKS 테스트 코드
+    def setUp(self):
+        token_cache.clear()
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="jwksuser@naver.com", password="password123"
+        )
+        self.rsa_key = {
+            "kid": "rsa-2024",
+            "algorithm": "RS256",
+            "private_key": generate_private_key_pem(
+                rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            ),
+        }
+        self.ed_key = {
+            "kid": "ed-2024",
+            "algorithm": "EdDSA",
+            "private_key": generate_private_key_pem(
+                ed25519.Ed25519PrivateKey.generate()
+            ),
+        }
+
+    def test_token_signed_with_active_key_verifies_with_jwks(self):
+        with override_settings(JWT_SIGNING_KEYS=[self.rsa_key]):
+            access_token = str(OurRefreshToken.for_user(self.user).access_token)
+            jwks = self.client.get(reverse("jwks")).json()
+
+            self.client.credentials(HTTP_AUTHORIZATION="Bearer " + access_token)
+            response = self.client.get(reverse("auth"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(jwt.get_unverified_header(access_token)["kid"], "rsa-2024")
+
+        # 다른 서비스는 JWKS 공개키만으로 토큰 검증 가능
+        public_key = jwt.PyJWK(jwks["keys"][0]).key
+        payload = jwt.decode(access_token, public_key, algorithms=["RS256"])
+        self.assertEqual(payload["user_id"], self.user.id)
+
+    def test_retired_key_still_published_and_verified(self):
+        with override_settings(JWT_SIGNING_KEYS=[self.rsa_key]):
+            old_token = str(OurRefreshToken.for_user(self.user).access_token)
+
+        retired_key = dict(self.rsa_key, retired_at="2099-01-01T00:00:00+00:00")
+        with override_settings(JWT_SIGNING_KEYS=[self.ed_key, retired_key]):
+            new_token = str(OurRefreshToken.for_user(self.user).access_token)
+            jwks = self.client.get(reverse("jwks")).json()
+
+            self.client.credentials(HTTP_AUTHORIZATION="Bearer " + old_token)
+            response = self.client.get(reverse("auth"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(jwt.get_unverified_header(new_token)["kid"], "ed-2024")
+        self.assertEqual([key["kid"] for key in jwks["keys"]], ["ed-2024", "rsa-2024"])
+
+    def test_expired_retired_key_not_published(self):
+        retired_key = dict(self.rsa_key, retired_at="2000-01-01T00:00:00+00:00")
+        with override_settings(JWT_SIGNING_KEYS=[self.ed_key, retired_key]):
+            jwks = self.client.get(reverse("jwks")).json()
+
+        self.assertEqual([key["kid"] for key in jwks["keys"]], ["ed-2024"])
+
+
+@override_settings(JWT_EMBED_USER_CLAIMS=True, BLACKLIST_FILTER_SYNC_INTERVAL=60)
+class EmbeddedUserClaimsTest(APITestCase):
+    # 토큰 클레임만으로 certificate 응답하는지 테스트 코드
+    def setUp(self):
+        user_cache.clear()
+        token_cache.clear()
+        blacklist_filter.reset()
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="claimsuser@naver.com", password="password123", is_staff=True
+        )
+        self.refresh = OurRefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(self.refresh.access_token)
+        )
+
+    def test_certificate_answered_from_claims(self):
+        # 블랙리스트 필터가 만들어진 뒤에는 User, 블랙리스트 테이블 모두 조회하지 않음
+        blacklist_filter.sync_if_due()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("auth"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "user_id": self.user.id,
+                "email": "claimsuser@naver.com",
+                "authentication": True,
+                "authorization": "admin",
+            },
+        )
+
+    def test_certificate_rejected_after_logout(self):
+        self.refresh.blacklist()
+
+        response = self.client.get(reverse("auth"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_certificate_checks_cached_user(self):
+        # 유저 캐시에 있는 비활성 상태/토큰 버전은 클레임보다 우선
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False, token_version=1
+        )
+        get_user_fields([self.user.pk])
+
+        response = self.client.get(reverse("auth"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_batch_rejects_logged_out_token(self):
+        other = get_user_model().objects.create_user(
+            email="claimsother@naver.com", password="password123"
+        )
+        other_token = str(OurRefreshToken.for_user(other).access_token)
+        self.refresh.blacklist()
+
+        response = self.client.post(
+            reverse("auth-batch"),
+            {"tokens": [str(self.refresh.access_token), other_token]},
+            format="json",
+        )
+
+        results = response.json()["results"]
+        self.assertFalse(results[0]["authentication"])
+        self.assertTrue(results[1]["authentication"])
+        self.assertEqual(results[1]["email"], "claimsother@naver.com")
+
+    def test_long_access_lifetime_fails_system_check(self):
+        self.assertEqual(check_embed_user_claims(None), [])
+
+        simple_jwt = {
+            **settings.SIMPLE_JWT,
+            "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
+        }
+        with override_settings(SIMPLE_JWT=simple_jwt):
+            errors = check_embed_user_claims(None)
+        self.assertEqual([error.id for error in errors], ["authapp.E001"])
+
+
+@override_settings(AUTH_CERTIFICATE_FAST_PATH="/auth/certificate")
+class CertificateFastPathTest(APITestCase):
+    # WSGI 경량 certificate 경로가 기존 응답과 같은지 테스트 코드
+    def setUp(self):
+        user_cache.clear()
+        token_cache.clear()
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="fastuser@naver.com", password="password123"
+        )
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.app = CertificateFastPathApp(self.fallback_app)
+
+    def fallback_app(self, environ, start_response):
+        start_response("404 Not Found", [])
+        return [b"fallback"]
+
+    def call(self, path="/auth/certificate", **headers):
+        environ = RequestFactory().get(path, **headers).environ
+        result = {}
+
+        def start_response(status, headers):
+            result["status"] = status
+            result["headers"] = dict(headers)
+
+        body = b"".join(self.app(environ, start_response))
+        return result["status"], result["headers"], body
+
+    def test_same_response_as_certificate_view(self):
+        authorization = "Bearer " + self.access_token
+        expected = self.client.get(reverse("auth"), HTTP_AUTHORIZATION=authorization)
+
+        status_line, headers, body = self.call(HTTP_AUTHORIZATION=authorization)
+
+        self.assertEqual(status_line, "200 OK")
+        self.assertEqual(body, expected.content)
+        self.assertEqual(headers["ETag"], expected["ETag"])
+        self.assertEqual(headers["Cache-Control"], expected["Cache-Control"])
+
+        # 약한 비교, 여러 ETag 목록도 Django와 같이 처리
+        for if_none_match in (
+            headers["ETag"],
+            f'"other", W/{headers["ETag"]}',
+            "*",
+        ):
+            status_line, _, body = self.call(
+                HTTP_AUTHORIZATION=authorization, HTTP_IF_NONE_MATCH=if_none_match
+            )
+            self.assertEqual(status_line, "304 Not Modified")
+            self.assertEqual(body, b"")
+
+        status_line, _, _ = self.call(
+            HTTP_AUTHORIZATION=authorization, HTTP_IF_NONE_MATCH='"other"'
+        )
+        self.assertEqual(status_line, "200 OK")
+
+    def test_unauthorized_responses_match(self):
+        for headers in ({}, {"HTTP_AUTHORIZATION": "Bearer invalid"}):
+            expected = self.client.get(reverse("auth"), **headers)
+
+            status_line, response_headers, body = self.call(**headers)
+
+            self.assertEqual(status_line, "401 Unauthorized")
+            self.assertEqual(json.loads(body), expected.json())
+            self.assertEqual(
+                response_headers["WWW-Authenticate"], expected["WWW-Authenticate"]
+            )
+
+    def test_other_paths_use_django(self):
+        status_line, _, body = self.call(path="/auth/login")
+
+        self.assertEqual(status_line, "404 Not Found")
+        self.assertEqual(body, b"fallback")
+
+
+@override_settings(
+    INTERNAL_SERVICE_TOKENS=["service-token"],
+    CHANGE_FEED_DELAY=0,
+    CHANGE_FEED_OVERLAP=0,
+)
+class RevocationFeedTest(APITestCase):
+    # 토큰 폐기 이벤트 피드 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="revokeuser@naver.com", password="password123"
+        )
+        self.url = reverse("revocations")
+        self.client.credentials(HTTP_X_SERVICE_TOKEN="service-token")
+
+    def test_logout_and_deactivation_recorded(self):
+        refresh = OurRefreshToken.for_user(self.user)
+        response = self.client.post(
+            reverse("logout"), {"refresh": str(refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        # 이미 비활성화된 유저를 다시 저장해도 이벤트는 한 번만 기록
+        self.user.save()
+
+        response = self.client.get(self.url)
+        events = response.json()["events"]
+        self.assertEqual(
+            [(event["kind"], event["user_id"]) for event in events],
+            [("token", self.user.id), ("user", self.user.id)],
+        )
+        self.assertEqual(events[0]["jti"], refresh["jti"])
+
+    def test_cursor_pagination(self):
+        for _ in range(3):
+            OurRefreshToken.for_user(self.user).blacklist()
+
+        response = self.client.get(self.url, {"limit": 2})
+        data = response.json()
+        self.assertEqual(len(data["events"]), 2)
+        self.assertTrue(data["has_more"])
+
+        response = self.client.get(self.url, {"since": data["next"], "limit": 2})
+        data = response.json()
+        self.assertEqual(len(data["events"]), 1)
+        self.assertFalse(data["has_more"])
+        self.assertEqual(data["next"], RevocationEvent.objects.last().seq)
+
+    @override_settings(CHANGE_FEED_OVERLAP=60)
+    def test_late_commit_sent_again(self):
+        for _ in range(3):
+            OurRefreshToken.for_user(self.user).blacklist()
+        # 가운데 이벤트의 트랜잭션이 첫 조회 이후에 커밋된 상황
+        late = RevocationEvent.objects.order_by("seq").values()[1]
+        RevocationEvent.objects.filter(seq=late["seq"]).delete()
+
+        data = self.client.get(self.url).json()
+        self.assertNotIn(late["seq"], [event["seq"] for event in data["events"]])
+
+        RevocationEvent.objects.create(**late)
+        response = self.client.get(self.url, {"since": data["next"]})
+        self.assertIn(
+            late["seq"], [event["seq"] for event in response.json()["events"]]
+        )
+        self.assertEqual(response.json()["next"], data["next"])
+
+    def test_service_token_required(self):
+        self.client.credentials(HTTP_X_SERVICE_TOKEN="wrong")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(
+    INTERNAL_SERVICE_TOKENS=["service-token"],
+    CHANGE_FEED_DELAY=0,
+    CHANGE_FEED_OVERLAP=0,
+)
+class UserChangeFeedTest(APITestCase):
+    # 유저 변경 이벤트 피드 테스트 코드
+    def setUp(self):
+        self.url = reverse("user-changes")
+        self.client.credentials(HTTP_X_SERVICE_TOKEN="service-token")
+        # 마이그레이션 시 생성된 슈퍼유저 이벤트 이후부터 확인
+        self.after = UserChangeEvent.objects.order_by("seq").last().seq
+
+    def get_changes(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_user_lifecycle_recorded(self):
+        User = get_user_model()
+        user = User.objects.create_user(email="change@naver.com", password="pw")
+        email_address = EmailAddress.objects.create(
+            user=user, email=user.email, primary=True, verified=False
+        )
+
+        email_address.verified = True
+        email_address.save()
+
+        user = User.objects.get(pk=user.pk)
+        user.email = "changed@naver.com"
+        user.save()
+        user.is_active = False
+        user.save()
+
+        data = self.get_changes(after=self.after)
+        self.assertEqual(data["columns"], UserChangeFeedView.columns)
+        self.assertEqual(
+            [row[2:] for row in data["changes"]],
+            [
+                ["created", "change@naver.com", True],
+                ["verified", "change@naver.com", True],
+                ["email_changed", "changed@naver.com", True],
+                ["deactivated", "changed@naver.com", False],
+            ],
+        )
+        self.assertEqual(data["next"], data["changes"][-1][0])
+
+    @patch.object(UserChangeFeedView, "chunk_size", 2)
+    def test_keyset_pagination(self):
+        User = get_user_model()
+        for i in range(5):
+            User.objects.create_user(email=f"page{i}@naver.com", password="pw")
+
+        data = self.get_changes(after=self.after, limit=3)
+        self.assertEqual(len(data["changes"]), 3)
+        self.assertTrue(data["has_more"])
+
+        data = self.get_changes(after=data["next"], limit=3)
+        self.assertEqual(
+            [row[3] for row in data["changes"]], ["page3@naver.com", "page4@naver.com"]
+        )
+        self.assertFalse(data["has_more"])
+
+    @override_settings(CHANGE_FEED_OVERLAP=60)
+    def test_late_commit_sent_again(self):
+        User = get_user_model()
+        for i in range(3):
+            User.objects.create_user(email=f"late{i}@naver.com", password="pw")
+        # 가운데 변경의 트랜잭션이 첫 조회 이후에 커밋된 상황
+        late = (
+            UserChangeEvent.objects.filter(seq__gt=self.after)
+            .order_by("seq")
+            .values()[1]
+        )
+        UserChangeEvent.objects.filter(seq=late["seq"]).delete()
+
+        data = self.get_changes(after=self.after)
+        self.assertNotIn(late["seq"], [row[0] for row in data["changes"]])
+
+        UserChangeEvent.objects.create(**late)
+        resent = self.get_changes(after=data["next"])
+        self.assertIn(late["seq"], [row[0] for row in resent["changes"]])
+        self.assertEqual(resent["next"], data["next"])
+        self.assertFalse(resent["has_more"])
+
+
+@override_settings(INTERNAL_SERVICE_TOKENS=["service-token"])
+class UserLookupTest(APITestCase):
+    # 유저 일괄 조회 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+
+        self.users = [
+            User.objects.create_user(
+                email=f"lookup{i}@naver.com", password="pw", is_staff=i == 0
+            )
+            for i in range(3)
+        ]
+        self.url = reverse("user-lookup")
+        self.client.credentials(HTTP_X_SERVICE_TOKEN="service-token")
+
+    def test_lookup_with_single_query(self):
+        ids = [user.id for user in self.users] + [999999]
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {"ids": ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(sorted(data["user_id"]), ids[:3])
+        rows = dict(zip(data["user_id"], data["authorization"]))
+        self.assertEqual(rows[self.users[0].id], "admin")
+        self.assertEqual(rows[self.users[1].id], "general")
+        self.assertEqual(data["not_found"], [999999])
+
+    def test_service_token_required(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer "
+            + str(RefreshToken.for_user(self.users[0]).access_token)
+        )
+
+        response = self.client.post(self.url, {"ids": [1]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(BLACKLIST_FILTER_SYNC_INTERVAL=60)
+class BlacklistFilterTest(APITestCase):
+    # refresh token 블랙리스트 Bloom filter 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="bloom@naver.com", password="password123"
+        )
+        blacklist_filter.reset()
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        jtis = [f"jti-{i}".encode() for i in range(1000)]
+        for jti in jtis:
+            bloom.add(jti)
+
+        self.assertTrue(all(jti in bloom for jti in jtis))
+        self.assertLess(bloom.estimated_false_positive_rate, 0.02)
+
+    def test_refresh_without_blacklist_query(self):
+        refresh = str(OurRefreshToken.for_user(self.user))
+        OurRefreshToken(refresh)  # 첫 확인에서 필터 생성
+
+        with self.assertNumQueries(0):
+            OurRefreshToken(refresh)
+
+    def test_blacklisted_token_rejected(self):
+        token = OurRefreshToken.for_user(self.user)
+        OurRefreshToken(str(token))
+        token.blacklist()
+
+        with self.assertRaises(TokenError):
+            OurRefreshToken(str(token))
+
+        stats = blacklist_filter.stats()
+        self.assertEqual(stats["items"], 1)
+        self.assertEqual(stats["db_checks"], 1)
+        self.assertGreater(stats["memory_bytes"], 0)
+
+    def test_sync_margin_does_not_add_twice(self):
+        # 여유 시간 안의 행은 sync마다 다시 조회되지만 필터에는 한 번만 추가
+        token = OurRefreshToken.for_user(self.user)
+        OurRefreshToken(str(token))
+        token.blacklist()
+
+        for _ in range(3):
+            blacklist_filter.next_sync = 0
+            blacklist_filter.sync_if_due()
+
+        self.assertEqual(blacklist_filter.stats()["items"], 1)
+
+    def test_reset_during_check(self):
+        # 확인 도중 reset()되어도 받아 온 필터로 처리
+        OurRefreshToken(str(OurRefreshToken.for_user(self.user)))
+        bloom = blacklist_filter.bloom
+
+        with patch.object(blacklist_filter, "sync_if_due", return_value=bloom):
+            blacklist_filter.reset()
+            self.assertFalse(blacklist_filter.is_blacklisted("0" * 32))
+
+
+class LogoutAllTest(APITestCase):
+    # 전체 로그아웃(token_version) 테스트 코드
+    def setUp(self):
+        user_cache.clear()
+        token_cache.clear()
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="logoutall@naver.com", password="password123"
+        )
+        self.refresh_tokens = [OurRefreshToken.for_user(self.user) for _ in range(3)]
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(self.refresh_tokens[0].access_token)
+        )
+
+    def test_all_tokens_revoked_with_single_update(self):
+        # 토큰 수와 관계없이 UPDATE 한 번 + 폐기 이벤트 기록
+        with self.assertNumQueries(2):
+            self.user.revoke_tokens()
+
+        event = RevocationEvent.objects.latest("seq")
+        self.assertEqual(event.kind, RevocationEvent.KIND_USER)
+        self.assertEqual(event.user_id, self.user.id)
+
+        for refresh in self.refresh_tokens:
+            response = self.client.post(
+                reverse("token_refresh"), {"refresh": str(refresh)}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.get(reverse("auth"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_all_endpoint(self):
+        response = self.client.post(reverse("logout-all"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["revocation_delay"], settings.AUTH_USER_CACHE_TTL
+        )
+
+        # 이전 토큰은 거부되고 새로 발급된 토큰은 사용 가능
+        response = self.client.post(reverse("logout-all"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.refresh_from_db()
+        refresh = OurRefreshToken.for_user(self.user)
+        response = self.client.post(
+            reverse("token_refresh"), {"refresh": str(refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_refresh_decodes_once_without_user_query(self):
+        refresh = str(self.refresh_tokens[1])
+        self.client.post(reverse("token_refresh"), {"refresh": refresh}, format="json")
+
+        # 유저 캐시와 블랙리스트 필터가 채워진 뒤에는 쿼리 없이 한 번만 디코드
+        with (
+            patch.object(token_backend, "decode", wraps=token_backend.decode) as decode,
+            self.assertNumQueries(0),
+        ):
+            response = self.client.post(
+                reverse("token_refresh"), {"refresh": refresh}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(decode.call_count, 1)
+
+    def test_deactivation_revokes_tokens(self):
+        self.user.is_active = False
+        self.user.save()
+        self.user.is_active = True
+        self.user.save()
+
+        response = self.client.get(reverse("auth"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PurgeExpiredTokensTest(TestCase):
+    # 만료 토큰 정리 커맨드 테스트 코드
+    def setUp(self):
+        now = timezone.now()
+        self.expired = [
+            OutstandingToken.objects.create(
+                jti=f"expired-{i}", token="", expires_at=now - timedelta(days=1)
+            )
+            for i in range(5)
+        ]
+        self.valid = OutstandingToken.objects.create(
+            jti="valid", token="", expires_at=now + timedelta(days=1)
+        )
+        BlacklistedToken.objects.create(token=self.expired[0])
+        BlacklistedToken.objects.create(token=self.valid)
+
+    def purge(self, *args):
+        out = StringIO()
+        call_command("purge_expired_tokens", "--sleep=0", *args, stdout=out)
+        return out.getvalue()
+
+    def test_purge_in_chunks(self):
+        output = self.purge("--store=outstanding", "--chunk-size=2")
+
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("jti", flat=True)), ["valid"]
+        )
+        self.assertEqual(BlacklistedToken.objects.get().token, self.valid)
+        self.assertEqual(output.count("last_pk="), 4)  # 청크 3개 + 결과
+        self.assertIn("Deleted 6 rows", output)  # 토큰 5개 + 블랙리스트 1개
+
+    def test_dry_run(self):
+        output = self.purge("--store=outstanding", "--dry-run")
+
+        self.assertEqual(OutstandingToken.objects.count(), 6)
+        self.assertIn("Would delete 6 rows", output)
+
+    def test_resume_after_pk(self):
+        self.purge("--store=outstanding", f"--start-after={self.expired[2].pk}")
+
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list("jti", flat=True)),
+            {"expired-0", "expired-1", "expired-2", "valid"},
+        )
+
+    def test_purge_issued_tokens(self):
+        User = get_user_model()
+        user = User.objects.create_user(email="purge@naver.com", password="pw")
+        valid = OurRefreshToken.for_user(user)
+        expired = OurRefreshToken.for_user(user)
+        expired.blacklist()
+        IssuedToken.objects.filter(jti=jti_to_bytes(expired["jti"])).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+
+        output = self.purge()
+
+        self.assertEqual(
+            list(IssuedToken.objects.values_list("jti", flat=True)),
+            [jti_to_bytes(valid["jti"])],
+        )
+        self.assertIn("Deleted 1 rows from issued_token", output)
+
+
+class IssuedTokenTest(APITestCase):
+    # 토큰 원문 없이 jti만 저장하는 토큰 저장소 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="issued@naver.com", password="password123"
+        )
+
+    def test_login_stores_compact_token(self):
+        response = self.client.post(
+            reverse("login"),
+            {"email": "issued@naver.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        refresh = OurRefreshToken(response.data["refresh"])
+        token = IssuedToken.objects.get()
+        self.assertEqual(bytes(token.jti), jti_to_bytes(refresh["jti"]))
+        self.assertEqual(token.user_id, self.user.id)
+        self.assertIsNone(token.blacklisted_at)
+        self.assertFalse(OutstandingToken.objects.exists())
+
+    def test_blacklist_once(self):
+        refresh = OurRefreshToken.for_user(self.user)
+        refresh.blacklist()
+        refresh.blacklist()
+
+        self.assertIsNotNone(IssuedToken.objects.get().blacklisted_at)
+        self.assertEqual(RevocationEvent.objects.filter(jti=refresh["jti"]).count(), 1)
+        with self.assertRaises(TokenError):
+            OurRefreshToken(str(refresh))
+
+    def test_blacklist_token_issued_before_store(self):
+        # issued_token 행이 없는 기존 토큰도 블랙리스트에 추가
+        refresh = OurRefreshToken.for_user(self.user)
+        IssuedToken.objects.all().delete()
+
+        refresh.blacklist()
+
+        token = IssuedToken.objects.get()
+        self.assertIsNone(token.created_at)
+        self.assertIsNotNone(token.blacklisted_at)
+
+
+@override_settings(LAST_LOGIN_FLUSH_INTERVAL=3600, LAST_LOGIN_FLUSH_SIZE=500)
+class LastLoginBufferTest(APITestCase):
+    # last_login 일괄 저장 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+
+        self.users = [
+            User.objects.create_user(email=f"login{i}@naver.com", password="pw")
+            for i in range(3)
+        ]
+
+    def test_flush_in_one_query(self):
+        buffer = LastLoginBuffer()
+        for user in self.users:
+            buffer.add(user.pk)
+
+        with self.assertNumQueries(1):
+            buffer.flush()
+
+        for user in self.users:
+            user.refresh_from_db()
+            self.assertIsNotNone(user.last_login)
+        self.assertEqual(buffer.stats(), {"pending": 0, "flushes": 1})
+
+    @override_settings(LAST_LOGIN_FLUSH_SIZE=2)
+    def test_flush_when_size_reached(self):
+        buffer = LastLoginBuffer()
+        buffer.add(self.users[0].pk)
+        self.assertEqual(buffer.stats()["pending"], 1)
+
+        buffer.add(self.users[1].pk)
+        self.assertEqual(buffer.stats(), {"pending": 0, "flushes": 1})
+
+    @override_settings(LAST_LOGIN_FLUSH_INTERVAL=0.05)
+    def test_flush_after_interval_without_logins(self):
+        # 이후 로그인이 없어도 백그라운드 스레드가 간격마다 저장
+        buffer = LastLoginBuffer()
+        flushed = threading.Event()
+
+        def flush():
+            buffer.pending.clear()
+            buffer.last_flush = time.monotonic()
+            flushed.set()
+
+        with patch.object(buffer, "flush", side_effect=flush):
+            buffer.add(self.users[0].pk)
+            self.assertTrue(flushed.wait(timeout=5))
+
+    @override_settings(LAST_LOGIN_BUFFER=True)
+    def test_login_buffers_last_login(self):
+        last_login_buffer.flush()
+
+        response = self.client.post(
+            reverse("login"),
+            {"email": "login0@naver.com", "password": "pw"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.users[0].refresh_from_db()
+        self.assertIsNone(self.users[0].last_login)
+
+        last_login_buffer.flush()
+        self.users[0].refresh_from_db()
+        self.assertIsNotNone(self.users[0].last_login)
+
+
+class LoginQueryCountTest(APITestCase):
+    # 로그인 쿼리 수 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            email="querycount@naver.com", password="password123"
+        )
+        EmailAddress.objects.create(
+            user=self.user, email=self.user.email, primary=True, verified=True
+        )
+        self.url = reverse("login")
+
+    def login(self, email, password):
+        return self.client.post(
+            self.url, {"email": email, "password": password}, format="json"
+        )
+
+    def test_success_in_two_queries(self):
+        # 유저 + 이메일 인증 여부 조회, 발급 토큰 저장
+        with self.assertNumQueries(2):
+            response = self.login("querycount@naver.com", "password123")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_wrong_password_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.login("querycount@naver.com", "wrong-password")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"][0], "올바르지 않은 비밀번호입니다.")
+
+    def test_unknown_email_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.login("nobody@naver.com", "password123")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"][0], "해당 계정은 존재하지 않습니다.")
+
+    def test_unverified_email_in_one_query(self):
+        EmailAddress.objects.filter(user=self.user).update(verified=False)
+
+        with self.assertNumQueries(1):
+            response = self.login("querycount@naver.com", "password123")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_inactive_user_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.login("querycount@naver.com", "password123")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_SIZE=1, PASSWORD_HASH_DEADLINE=5
+)
+class PasswordHashExecutorTest(APITestCase):
+    # 비밀번호 해시 실행기 테스트 코드
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        settings_override = override_settings(
+            PASSWORD_HASH_SLOTS_PATH=os.path.join(tmp_dir.name, "password-hash")
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.executor = HashingExecutor()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def block(self, count):
+        # 해시 계산 대신 release될 때까지 실행기 슬롯을 점유
+        running = threading.Event()
+
+        def hold():
+            running.set()
+            self.release.wait()
+
+        def run():
+            try:
+                self.executor.run(hold)
+            except PasswordHashingUnavailable:
+                pass
+
+        threads = [threading.Thread(target=run) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        # 첫 작업이 스레드 풀에서 실행을 시작하고 나머지는 대기열에 들어갈 때까지
+        self.assertTrue(running.wait(timeout=5))
+        while self.executor.stats()["depth"] < count:
+            time.sleep(0.01)
+        return threads
+
+    def test_rejects_when_saturated(self):
+        threads = self.block(2)  # 실행 중 1 + 대기 1
+
+        with self.assertRaises(PasswordHashingUnavailable):
+            self.executor.run(lambda: None)
+
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.executor.run(lambda: "ok"), "ok")
+
+        stats = self.executor.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["max_depth"], 2)
+
+    def test_rejects_after_deadline(self):
+        threads = self.block(1)
+
+        with override_settings(PASSWORD_HASH_DEADLINE=0.05):
+            with self.assertRaises(PasswordHashingUnavailable):
+                self.executor.run(lambda: None)
+
+        # 대기하던 작업은 기한 초과로 취소되어 슬롯 반환, 점유 작업만 완료
+        self.release.set()
+        threads[0].join()
+        while self.executor.stats()["depth"]:
+            time.sleep(0.01)
+        stats = self.executor.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["completed"], 1)
+
+    def hold_in_worker(self):
+        # 다른 gunicorn 워커(fork된 자식 프로세스)가 해시 계산 중인 상황
+        context = multiprocessing.get_context("fork")
+        ready, release = context.Event(), context.Event()
+
+        def hold():
+            HashingExecutor().run(lambda: (ready.set(), release.wait()))
+
+        worker = context.Process(target=hold)
+        worker.start()
+        self.addCleanup(self.stop_worker, worker, release)
+        self.assertTrue(ready.wait(timeout=5))
+        return worker, release
+
+    def stop_worker(self, worker, release):
+        # 종료된 프로세스가 기다리던 Event를 set하면 깨어나기를 기다리며 멈추므로 살아 있을 때만
+        if worker.is_alive():
+            release.set()
+        worker.join(timeout=5)
+        worker.kill()
+
+    @override_settings(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_MAX_CONCURRENT=2)
+    def test_limit_shared_across_processes(self):
+        _, release = self.hold_in_worker()
+        self.hold_in_worker()
+
+        # 이 프로세스는 아무것도 실행 중이 아니지만 서버 전체 슬롯이 가득 참
+        with self.assertRaises(PasswordHashingUnavailable):
+            self.executor.run(lambda: None)
+        self.assertEqual(self.executor.stats()["rejected"], 1)
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                self.assertEqual(self.executor.run(lambda: "ok"), "ok")
+                break
+            except PasswordHashingUnavailable:
+                time.sleep(0.01)
+        else:
+            self.fail("slot was not released")
+
+    @override_settings(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_MAX_CONCURRENT=1)
+    def test_slot_released_when_worker_dies(self):
+        worker, _ = self.hold_in_worker()
+        with self.assertRaises(PasswordHashingUnavailable):
+            self.executor.run(lambda: None)
+
+        worker.kill()
+        worker.join()
+        self.assertEqual(self.executor.run(lambda: "ok"), "ok")
+
+    @override_settings(PASSWORD_HASH_MAX_CONCURRENT=2)
+    def test_limit_shared_by_threads_in_process(self):
+        # 같은 프로세스의 스레드도 공유 슬롯을 하나씩 사용
+        threads = self.block(2)
+
+        with self.assertRaises(PasswordHashingUnavailable):
+            self.executor.run(lambda: None)
+
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.executor.run(lambda: "ok"), "ok")
+
+    def test_login_returns_503_when_saturated(self):
+        User = get_user_model()
+        User.objects.create_user(email="busy@naver.com", password="password123")
+
+        with patch.object(
+            password_hasher, "run", side_effect=PasswordHashingUnavailable
+        ):
+            response = self.client.post(
+                reverse("login"),
+                {"email": "busy@naver.com", "password": "password123"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        "apps.authapp.hashers.TunedPBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ],
+    PASSWORD_HASHER_PARAMS={"pbkdf2_sha256": {"iterations": 1000}},
+)
+class PasswordRehashTest(APITestCase):
+    # 로그인 시 비밀번호 재해시, 해셔 벤치마크 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+
+        self.user = User.objects.create_user(email="rehash@naver.com")
+        self.user.password = make_password("password123", hasher="md5")
+        self.user.save()
+
+    def login(self):
+        return self.client.post(
+            reverse("login"),
+            {"email": "rehash@naver.com", "password": "password123"},
+            format="json",
+        )
+
+    def test_rehash_to_default_hasher_on_login(self):
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+        # 반복 횟수를 바꾸면 다음 로그인 때 다시 해시
+        with self.settings(
+            PASSWORD_HASHER_PARAMS={"pbkdf2_sha256": {"iterations": 2000}}
+        ):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+        self.assertTrue(self.user.check_password("password123"))
+
+    def test_login_succeeds_when_rehash_rejected(self):
+        password = self.user.password
+        # 확인은 슬롯을 얻고 재해시 때는 슬롯이 모두 사용 중인 상황
+        with patch.object(
+            password_hasher,
+            "_acquire_shared",
+            side_effect=[None, PasswordHashingUnavailable()],
+        ):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, password)
+
+    def test_failed_login_keeps_hash(self):
+        password = self.user.password
+        self.client.post(
+            reverse("login"),
+            {"email": "rehash@naver.com", "password": "wrong-password"},
+            format="json",
+        )
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, password)
+
+    def test_benchmark_recommends_params(self):
+        out = StringIO()
+        call_command(
+            "benchmark_password_hashers", "--samples=1", "--target-ms=100", stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn("pbkdf2_sha256 (TunedPBKDF2PasswordHasher) [default]", output)
+        self.assertIn("iterations: 1000 ->", output)
+        self.assertIn("PASSWORD_HASHER_PARAMS = {'pbkdf2_sha256'", output)
+
+
+@patch("apps.authapp.views.CustomRegisterView.is_valid_email_domain", return_value=True)
+class RegisterQueryCountTest(APITestCase):
+    # 회원가입 쿼리 수 테스트 코드
+    def setUp(self):
+        # 프로세스 캐시에 Site를 미리 올려 둠 (확인 이메일 링크 생성용)
+        Site.objects.get_current()
+        self.url = reverse("signup")
+
+    def signup(self, email, password="Str0ng!pass#"):
+        return self.client.post(
+            self.url,
+            {"email": email, "password1": password, "password2": password},
+            format="json",
+        )
+
+    def test_success_in_one_transaction(self, mock_domain):
+        # SAVEPOINT, 유저 + 변경 이벤트 + 이메일 주소 INSERT, RELEASE (검증 조회 없음)
+        with self.assertNumQueries(5):
+            response = self.signup("newuser@naver.com")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        user = get_user_model().objects.get(email="newuser@naver.com")
+        self.assertTrue(user.check_password("Str0ng!pass#"))
+        self.assertTrue(
+            EmailAddress.objects.filter(
+                user=user, email="newuser@naver.com", primary=True, verified=False
+            ).exists()
+        )
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("newuser@naver.com", mail.outbox[0].to)
+
+    def test_duplicate_email_rolled_back(self, mock_domain):
+        get_user_model().objects.create_user(
+            email="taken@naver.com", password="password123"
+        )
+
+        # SAVEPOINT, 유저 INSERT (unique 위반), ROLLBACK TO / RELEASE SAVEPOINT
+        with self.assertNumQueries(4):
+            response = self.signup("taken@naver.com")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"], "이미 사용 중인 이메일입니다")
+        self.assertFalse(EmailAddress.objects.filter(email="taken@naver.com").exists())
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_password_mismatch(self, mock_domain):
+        response = self.client.post(
+            self.url,
+            {
+                "email": "mismatch@naver.com",
+                "password1": "Str0ng!pass#",
+                "password2": "Other!pass#1",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"], "비밀번호가 일치하지 않습니다")
+        self.assertFalse(
+            get_user_model().objects.filter(email="mismatch@naver.com").exists()
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "email_domains": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "email-domains-test",
+        },
+    },
+    MX_PRELOADED_DOMAINS=frozenset(["gmail.com"]),
+)
+class MXLookupCacheTest(TestCase):
+    # 이메일 도메인 MX 조회 캐시 테스트 코드
+    def setUp(self):
+        self.cache = MXLookupCache()
+
+    def mx_answer(self, ttl):
+        answer = Mock()
+        answer.rrset.ttl = ttl
+        return answer
+
+    @patch("dns.resolver.resolve")
+    def test_preloaded_domain_not_resolved(self, mock_resolve):
+        self.assertTrue(self.cache.is_valid("Gmail.com"))
+        mock_resolve.assert_not_called()
+        self.assertEqual(self.cache.stats()["preloaded"], 1)
+
+    @patch("dns.resolver.resolve")
+    def test_mx_record_cached_with_ttl(self, mock_resolve):
+        mock_resolve.return_value = self.mx_answer(600)
+
+        self.assertTrue(self.cache.is_valid("example.com"))
+        self.assertTrue(self.cache.is_valid("example.com"))
+        mock_resolve.assert_called_once_with(
+            "example.com", "MX", lifetime=settings.MX_LOOKUP_TIMEOUT
+        )
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        # 다른 워커(새 인스턴스)도 공유 캐시의 결과를 사용
+        self.assertTrue(MXLookupCache().is_valid("example.com"))
+        mock_resolve.assert_called_once()
+
+    @patch("dns.resolver.resolve")
+    def test_nxdomain_cached(self, mock_resolve):
+        mock_resolve.side_effect = dns.resolver.NXDOMAIN()
+
+        self.assertFalse(self.cache.is_valid("no-such-domain.example"))
+        self.assertFalse(self.cache.is_valid("no-such-domain.example"))
+        mock_resolve.assert_called_once()
+
+    @patch("dns.resolver.resolve")
+    def test_timeout_allowed_and_not_cached(self, mock_resolve):
+        mock_resolve.side_effect = dns.resolver.LifetimeTimeout(timeout=2, errors={})
+
+        self.assertTrue(self.cache.is_valid("slow.example"))
+        self.assertTrue(self.cache.is_valid("slow.example"))
+        self.assertEqual(mock_resolve.call_count, 2)
+        self.assertEqual(self.cache.stats()["timeouts"], 2)
+
+
+@override_settings(GOOGLE_ID_TOKEN_AUDIENCES=["test-client-id"])
+class GoogleIdTokenTest(APITestCase):
+    # 구글 ID token 로컬 검증 테스트 코드
+    def setUp(self):
+        self.private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        jwk = json.loads(
+            jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key())
+        )
+        jwk.update({"kid": "google-test", "alg": "RS256", "use": "sig"})
+        self.jwks = {"keys": [jwk]}
+        self.fetches = 0
+
+        # 구글 대신 로컬 공개키를 반환
+        def fetch():
+            self.fetches += 1
+            return self.jwks, 3600
+
+        google_keys.reset()
+        patcher = patch.object(google_keys, "fetch", fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(google_keys.reset)
+
+        self.url = reverse("google-login-callback")
+
+    def id_token(self, kid="google-test", **claims):
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": "test-client-id",
+            "sub": "1234567890",
+            "email": "googleuser@gmail.com",
+            "email_verified": True,
+            "iat": now,
+            "exp": now + 3600,
+        }
+        payload.update(claims)
+        return jwt.encode(
+            payload, self.private_key, algorithm="RS256", headers={"kid": kid}
+        )
+
+    def login(self, id_token):
+        return self.client.post(self.url, {"id_token": id_token}, format="json")
+
+    def test_new_user_created_with_cached_keys(self):
+        response = self.login(self.id_token())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["email"], "googleuser@gmail.com")
+        self.assertFalse(
+            get_user_model()
+            .objects.get(email="googleuser@gmail.com")
+            .has_usable_password()
+        )
+        self.assertEqual(ProfileOutbox.objects.count(), 1)
+
+        # 두 번째 로그인은 캐시된 공개키 사용
+        self.assertEqual(self.login(self.id_token()).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.fetches, 1)
+
+    def test_invalid_tokens_rejected(self):
+        invalid_tokens = [
+            self.id_token(aud="other-client-id"),
+            self.id_token(iss="https://evil.example.com"),
+            self.id_token(exp=int(time.time()) - 3600),
+            self.id_token(email_verified=False),
+            self.id_token()[:-4] + "AAAA",
+            "not-a-jwt",
+        ]
+        for id_token in invalid_tokens:
+            response = self.login(id_token)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_kid_refetches_keys_once(self):
+        self.assertEqual(self.login(self.id_token()).status_code, status.HTTP_200_OK)
+
+        # 교체된 키를 모르는 상태에서는 최소 간격 동안 다시 가져오지 않음
+        for _ in range(3):
+            response = self.login(self.id_token(kid="rotated"))
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.fetches, 1)
+
+        with self.settings(GOOGLE_JWKS_MIN_REFRESH_INTERVAL=0):
+            self.jwks["keys"][0]["kid"] = "rotated"
+            response = self.login(self.id_token(kid="rotated"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.fetches, 2)
+
+    def test_empty_key_set_keeps_cached_keys(self):
+        self.assertEqual(self.login(self.id_token()).status_code, status.HTTP_200_OK)
+
+        # 구글이 빈 키 목록을 반환해도 500 대신 기존 키를 계속 사용
+        self.jwks = {"keys": []}
+        with self.settings(GOOGLE_JWKS_MIN_REFRESH_INTERVAL=0):
+            response = self.login(self.id_token(kid="rotated"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(google_keys.failures, 1)
+        self.assertEqual(self.login(self.id_token()).status_code, status.HTTP_200_OK)
+
+    def test_empty_audiences_fails_system_check(self):
+        self.assertEqual(check_google_id_token_audiences(None), [])
+
+        with self.settings(GOOGLE_ID_TOKEN_AUDIENCES=[]):
+            errors = check_google_id_token_audiences(None)
+        self.assertEqual([error.id for error in errors], ["authapp.E002"])
+
+    def test_existing_user_looked_up_in_one_query(self):
+        user = get_user_model().objects.create_user(
+            email="googleuser@gmail.com", password="password123"
+        )
+        EmailAddress.objects.create(
+            user=user, email=user.email, primary=True, verified=True
+        )
+        google_keys.get_key("google-test")
+
+        # 유저 + 미인증 이메일 조회, 발급 토큰 저장
+        with self.assertNumQueries(2):
+            response = self.login(self.id_token())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(ProfileOutbox.objects.exists())
+
+    def test_unverified_email_verified_by_google_login(self):
+        user = get_user_model().objects.create_user(
+            email="googleuser@gmail.com", password="password123"
+        )
+        EmailAddress.objects.create(
+            user=user, email=user.email, primary=True, verified=False
+        )
+
+        self.assertEqual(self.login(self.id_token()).status_code, status.HTTP_200_OK)
+        self.assertTrue(EmailAddress.objects.get(user=user).verified)
+        self.assertEqual(
+            list(ProfileOutbox.objects.values_list("user_id", flat=True)), [user.id]
+        )
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    # spring 대신 정해진 응답을 반환하고 요청을 기록
+    def __init__(self, *status_codes):
+        self.status_codes = list(status_codes)
+        self.requests = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.requests.append((json, headers))
+        status_code = self.status_codes.pop(0)
+        if status_code is None:
+            raise requests.ConnectionError("connection refused")
+        return FakeResponse(status_code, "error")
+
+
+class ProfileOutboxTest(APITestCase):
+    # spring 프로필 생성 outbox 테스트 코드
+    def test_email_confirmation_enqueues_profile(self):
+        user = get_user_model().objects.create_user(
+            email="outbox@naver.com", password="password123"
+        )
+        email_address = EmailAddress.objects.create(
+            user=user, email=user.email, primary=True, verified=False
+        )
+        key = EmailConfirmationHMAC(email_address).key
+
+        with patch("requests.post") as mock_post:
+            response = self.client.get(reverse("account_confirm_email", args=[key]))
+            # 이미 인증된 링크를 다시 열어도 중복 요청하지 않음
+            self.client.get(reverse("account_confirm_email", args=[key]))
+        mock_post.assert_not_called()
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(
+            list(ProfileOutbox.objects.values_list("user_id", flat=True)), [user.id]
+        )
+
+    def test_dispatch_deletes_sent_and_backs_off_failed(self):
+        sent = ProfileOutbox.objects.create(user_id=1)
+        failed = ProfileOutbox.objects.create(user_id=2)
+        ProfileOutbox.objects.create(user_id=3)  # 409: 이미 생성된 프로필
+        session = FakeSession(201, None, 409)
+
+        stats = ProfileDispatcher(session).dispatch_batch(batch_size=10)
+
+        self.assertEqual((stats["sent"], stats["failed"]), (2, 1))
+        self.assertEqual(
+            list(ProfileOutbox.objects.values_list("pk", flat=True)), [failed.pk]
+        )
+        self.assertEqual(
+            session.requests[0],
+            ({"id": 1}, {"Idempotency-Key": str(sent.idempotency_key)}),
+        )
+
+        failed.refresh_from_db()
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn("ConnectionError", failed.last_error)
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+
+        # 백오프 시각 전에는 다시 보내지 않음
+        self.assertEqual(
+            ProfileDispatcher(FakeSession()).dispatch_batch(10)["fetched"], 0
+        )
+
+    def test_retry_delay_doubles_up_to_max(self):
+        with self.settings(
+            PROFILE_OUTBOX_BASE_BACKOFF=5, PROFILE_OUTBOX_MAX_BACKOFF=30
+        ):
+            self.assertEqual(
+                [retry_delay(attempts) for attempts in range(1, 6)], [5, 10, 20, 30, 30]
+            )
+
+    def test_command_drains_in_batches(self):
+        for user_id in range(5):
+            ProfileOutbox.objects.create(user_id=user_id)
+
+        out = StringIO()
+        with patch("apps.authapp.profile_outbox.requests.Session") as mock_session:
+            mock_session.return_value = FakeSession(*[201] * 5)
+            call_command("dispatch_profile_outbox", "--batch-size=2", stdout=out)
+
+        self.assertFalse(ProfileOutbox.objects.exists())
+        output = out.getvalue()
+        self.assertEqual(output.count("sent="), 3)
+        self.assertIn("Sent 5 profile requests, 0 failed (0 pending", output)
+
+
+class BackfillProfilesTest(APITestCase):
+    # 인증된 유저 spring 프로필 일괄 생성 커맨드 테스트 코드
+    def setUp(self):
+        User = get_user_model()
+        self.verified = []
+        for i in range(5):
+            user = User.objects.create_user(email=f"backfill{i}@naver.com")
+            EmailAddress.objects.create(
+                user=user, email=user.email, primary=True, verified=True
+            )
+            self.verified.append(user.id)
+
+        unverified = User.objects.create_user(email="unverified@naver.com")
+        EmailAddress.objects.create(
+            user=unverified, email=unverified.email, primary=True, verified=False
+        )
+
+        self.sent = []
+        self.fail_user_ids = set()
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        with self.lock:
+            self.sent.append((json["id"], headers["Idempotency-Key"]))
+        if json["id"] in self.fail_user_ids:
+            raise requests.ConnectionError("connection refused")
+        return FakeResponse(201)
+
+    def backfill(self, *args):
+        out = StringIO()
+        with patch(
+            "apps.authapp.management.commands.backfill_profiles.requests.Session"
+        ) as mock_session:
+            mock_session.return_value.post = self.post
+            call_command(
+                "backfill_profiles", "--chunk-size=2", "--rate=0", *args, stdout=out
+            )
+        return out.getvalue()
+
+    def test_sends_verified_users_and_queues_failures(self):
+        self.fail_user_ids = {self.verified[1]}
+
+        output = self.backfill()
+
+        self.assertEqual(sorted(user_id for user_id, _ in self.sent), self.verified)
+        self.assertEqual(
+            list(ProfileOutbox.objects.values_list("user_id", flat=True)),
+            [self.verified[1]],
+        )
+        self.assertIn("Sent 5 profile requests", output)
+        self.assertIn("1 queued for retry", output)
+
+        # 다시 실행해도 같은 유저는 같은 Idempotency-Key, outbox 재시도도 같은 키
+        keys = dict(self.sent)
+        self.assertEqual(
+            ProfileOutbox.objects.get().idempotency_key,
+            uuid.UUID(keys[self.verified[1]]),
+        )
+        self.sent = []
+        self.backfill()
+        self.assertEqual(dict(self.sent), keys)
+        # 다시 실패해도 outbox에는 한 행만 유지
+        self.assertEqual(ProfileOutbox.objects.count(), 1)
+
+    def test_resumes_from_checkpoint(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        checkpoint = os.path.join(tmp_dir.name, "checkpoint")
+        with open(checkpoint, "w") as f:
+            f.write(str(self.verified[2]))
+
+        self.backfill(f"--checkpoint-file={checkpoint}")
+
+        self.assertEqual(sorted(user_id for user_id, _ in self.sent), self.verified[3:])
+        with open(checkpoint) as f:
+            self.assertEqual(int(f.read()), self.verified[-1])
+
+    def test_dry_run_sends_nothing(self):
+        output = self.backfill("--dry-run")
+        self.assertEqual(self.sent, [])
+        self.assertIn("Would send 5 profile requests", output)
+
+
+class FlakySMTPConnection:
+    # 첫 발송에서 서버가 연결을 끊는 SMTP 연결 대신 사용
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.opened = 0
+        self.closed = 0
+        self.sent = []
+
+    def open(self):
+        self.opened += 1
+
+    def close(self):
+        self.closed += 1
+
+    def send_messages(self, messages):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.extend(messages)
+        return len(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND="apps.authapp.mail.QueuedEmailBackend",
+    QUEUED_EMAIL_DELIVERY_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    QUEUED_EMAIL_RATE_PER_MINUTE=0,
+)
+class QueuedEmailTest(APITestCase):
+    # 메일 발송 큐 테스트 코드
+    @patch(
+        "apps.authapp.views.CustomRegisterView.is_valid_email_domain",
+        return_value=True,
+    )
+    def test_signup_mail_queued_then_sent_by_worker(self, mock_domain):
+        response = self.client.post(
+            reverse("signup"),
+            {
+                "email": "queued@naver.com",
+                "password1": "Str0ng!pass#",
+                "password2": "Str0ng!pass#",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+
+        out = StringIO()
+        call_command("send_queued_email", stdout=out)
+
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["queued@naver.com"])
+        self.assertIn("Sent 1 emails, 0 failed", out.getvalue())
+
+    def test_message_round_trip(self):
+        message = EmailMultiAlternatives(
+            "제목",
+            "본문",
+            "noreply@example.com",
+            ["to@naver.com"],
+            bcc=["bcc@naver.com"],
+        )
+        message.attach_alternative("<p>본문</p>", "text/html")
+        message.attach("data.bin", b"\x00\x01", "application/octet-stream")
+
+        restored = deserialize_message(
+            json.loads(json.dumps(serialize_message(message)))
+        )
+        self.assertEqual(restored.recipients(), message.recipients())
+        self.assertEqual(restored.alternatives, [("<p>본문</p>", "text/html")])
+        self.assertEqual(
+            restored.attachments,
+            [("data.bin", b"\x00\x01", "application/octet-stream")],
+        )
+        self.assertEqual(restored.message()["Subject"], message.message()["Subject"])
+
+    def test_reconnects_once_after_disconnect(self):
+        send_mail("제목", "본문", None, ["to@naver.com"])
+        connection = FlakySMTPConnection([smtplib.SMTPServerDisconnected()])
+
+        stats = MailDispatcher(connection).dispatch_batch(10)
+
+        self.assertEqual(stats["sent"], 1)
+        self.assertEqual(len(connection.sent), 1)
+        self.assertEqual(connection.opened, 2)
+
+    def test_failure_backs_off_then_dropped(self):
+        send_mail("제목", "본문", None, ["to@naver.com"])
+        error = smtplib.SMTPDataError(451, "try again later")
+
+        stats = MailDispatcher(FlakySMTPConnection([error])).dispatch_batch(10)
+        self.assertEqual(stats["failed"], 1)
+        entry = QueuedEmail.objects.get()
+        self.assertEqual(entry.attempts, 1)
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        with self.settings(QUEUED_EMAIL_MAX_ATTEMPTS=2):
+            stats = MailDispatcher(FlakySMTPConnection([error])).dispatch_batch(10)
+        self.assertEqual(stats["dropped"], 1)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_rate_limit_per_minute(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = MinuteRateLimiter(2, clock=lambda: now[0], sleep=sleep)
+        limiter.wait()
+        now[0] = 10.0
+        limiter.wait()
+        now[0] = 20.0
+        limiter.wait()  # 0초에 보낸 메일이 60초가 지날 때까지 대기
+
+        self.assertEqual(sleeps, [40.0])
+
+
+class ThrottleTest(APITestCase):
+    # 로그인/회원가입/비밀번호 재설정 요청 수 제한 테스트 코드
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        settings_override = override_settings(
+            AUTH_THROTTLE_RATES={
+                "login_ip": "3/min",
+                "login_email": "2/min",
+                "signup_ip": "1/hour",
+            },
+            AUTH_THROTTLE_STORE_PATH=os.path.join(tmp_dir.name, "throttle"),
+            AUTH_THROTTLE_STORE_SLOTS=1024,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        get_user_model().objects.create_user(
+            email="throttle@naver.com", password="password123"
+        )
+
+    def login(self, email, ip="127.0.0.1"):
+        return self.client.post(
+            reverse("login"),
+            {"email": email, "password": "wrong-password"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_email_limit_rejects_before_user_lookup(self):
+        self.login("throttle@naver.com")
+        self.login("Throttle@naver.com")
+
+        # 제한을 넘은 요청은 유저 조회, 비밀번호 해시 없이 거부
+        with self.assertNumQueries(0):
+            response = self.login("throttle@naver.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+    def test_non_object_body_not_throttled_by_email(self):
+        response = self.client.post(reverse("login"), ["email"], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ip_limit_across_emails(self):
+        for i in range(3):
+            self.assertNotEqual(
+                self.login(f"user{i}@naver.com").status_code,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+        response = self.login("user3@naver.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_forwarded_for_trusted_only_from_proxy(self):
+        for i in range(3):
+            self.client.post(
+                reverse("login"),
+                {"email": f"user{i}@naver.com", "password": "wrong-password"},
+                format="json",
+                REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=f"192.0.2.{i}",
+            )
+        # 프록시가 아닌 주소가 보낸 X-Forwarded-For는 무시
+        response = self.login("user3@naver.com", ip="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        with self.settings(
+            AUTH_THROTTLE_TRUSTED_PROXIES=["172.16.0.0/12"],
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1},
+        ):
+            response = self.client.post(
+                reverse("login"),
+                {"email": "user4@naver.com", "password": "wrong-password"},
+                format="json",
+                REMOTE_ADDR="172.18.0.2",
+                HTTP_X_FORWARDED_FOR="192.0.2.9, 10.0.0.1",
+            )
+        # nginx가 추가한 마지막 주소 기준으로 제한
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_blocked_ip_does_not_drain_email_bucket(self):
+        for i in range(3):
+            self.login(f"user{i}@naver.com", ip="10.0.0.1")
+
+        # IP 제한에 걸린 요청은 email 버킷의 토큰을 사용하지 않음
+        for _ in range(3):
+            response = self.login("throttle@naver.com", ip="10.0.0.1")
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        for _ in range(2):
+            response = self.login("throttle@naver.com", ip="10.0.0.2")
+            self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @patch(
+        "apps.authapp.views.CustomRegisterView.is_valid_email_domain",
+        return_value=False,
+    )
+    def test_signup_rejected_before_mx_lookup(self, mock_domain):
+        data = {
+            "email": "new@naver.com",
+            "password1": "Str0ng!pass#",
+            "password2": "Str0ng!pass#",
+        }
+        self.client.post(reverse("signup"), data, format="json")
+        response = self.client.post(reverse("signup"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        mock_domain.assert_called_once()
+
+    def test_bucket_refills(self):
+        with patch("apps.authapp.throttling.time.time", return_value=1000.0):
+            self.assertTrue(bucket_store.consume([("refill", 2, 1 / 30)])[0])
+            self.assertTrue(bucket_store.consume([("refill", 2, 1 / 30)])[0])
+            allowed, wait = bucket_store.consume([("refill", 2, 1 / 30)])
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 30.0)
+
+        with patch("apps.authapp.throttling.time.time", return_value=1030.0):
+            self.assertTrue(bucket_store.consume([("refill", 2, 1 / 30)])[0])
+
+    def test_buckets_shared_between_processes(self):
+        bucket_store.consume([("shared", 2, 1 / 60)])
+
+        # fork된 워커가 같은 파일의 버킷을 사용
+        pid = os.fork()
+        if pid == 0:
+            bucket_store.consume([("shared", 2, 1 / 60)])
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        self.assertFalse(bucket_store.consume([("shared", 2, 1 / 60)])[0])
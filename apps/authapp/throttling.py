@@ -0,0 +1,199 @@
+import fcntl
+import hashlib
+import ipaddress
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# 슬롯 하나: 키 해시(8바이트), 남은 토큰 수, 마지막 갱신 시각(time.time)
+SLOT = struct.Struct("<Qdd")
+# 키 해시 위치부터 몇 개의 슬롯을 확인할지 (모두 사용 중이면 가장 오래된 슬롯을 재사용)
+PROBES = 8
+
+
+class SharedTokenBucketStore:
+    """
+    한 서버의 gunicorn 워커들이 함께 사용하는 token bucket 저장소.
+    AUTH_THROTTLE_STORE_PATH 파일을 mmap으로 공유하고 flock으로 갱신을 직렬화한다.
+    슬롯이 부족하면 오래된 버킷부터 재사용하므로 제한이 느슨해질 수는 있어도 요청을 잘못 막지는 않는다.
+    """
+
+    def __init__(self):
+        self._pid = None
+        self._path = None
+        self._fd = None
+        self._mmap = None
+        self._slots = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        # fork된 워커마다 파일을 따로 열어야 flock이 프로세스 간에 동작함
+        path = settings.AUTH_THROTTLE_STORE_PATH
+        if self._pid == os.getpid() and self._path == path:
+            return
+
+        self._close()
+        slots = settings.AUTH_THROTTLE_STORE_SLOTS
+        size = slots * SLOT.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+        self._fd = fd
+        self._mmap = mmap.mmap(fd, size)
+        self._slots = slots
+        self._path = path
+        self._pid = os.getpid()
+
+    def _close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            os.close(self._fd)
+        self._fd = self._mmap = self._pid = self._path = None
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield self._mmap
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _find(self, buf, key_hash, capacity, refill_rate, now, taken):
+        # key_hash 버킷의 (슬롯 번호, 현재 토큰 수), 없으면 새로 사용할 슬롯
+        # 이 시간이 지나면 버킷이 가득 차므로 저장하지 않은 것과 같음
+        full_after = capacity / refill_rate
+        start = key_hash % self._slots
+        free = oldest = None
+        for i in range(PROBES):
+            slot = (start + i) % self._slots
+            slot_hash, slot_tokens, updated_at = SLOT.unpack_from(buf, slot * SLOT.size)
+            if slot_hash == key_hash:
+                elapsed = max(now - updated_at, 0)
+                return slot, min(capacity, slot_tokens + elapsed * refill_rate)
+            # 같은 요청의 다른 버킷이 고른 슬롯은 제외
+            if slot in taken:
+                continue
+            if free is None and (slot_hash == 0 or now - updated_at >= full_after):
+                free = slot
+            if oldest is None or updated_at < oldest[1]:
+                oldest = (slot, updated_at)
+
+        return (free if free is not None else oldest[0]), capacity
+
+    def consume(self, buckets):
+        """
+        (key, capacity, refill_rate) 버킷들에서 토큰을 하나씩 사용.
+        모든 버킷에 토큰이 있을 때만 함께 사용하고, 하나라도 없으면 어느 버킷도 줄이지 않는다.
+        (허용 여부, 다음 토큰까지 남은 초) 반환.
+        버킷은 capacity개로 시작하고 초당 refill_rate개씩 다시 채워진다.
+        """
+        now = time.time()
+        with self._locked() as buf:
+            found = []
+            taken = set()
+            for key, capacity, refill_rate in buckets:
+                key_hash = int.from_bytes(
+                    hashlib.blake2b(key.encode(), digest_size=8).digest(), "little"
+                )
+                key_hash = key_hash or 1  # 0은 빈 슬롯
+                index, tokens = self._find(
+                    buf, key_hash, capacity, refill_rate, now, taken
+                )
+                taken.add(index)
+                found.append((index, key_hash, tokens, refill_rate))
+
+            waits = [
+                (1 - tokens) / refill_rate
+                for _, _, tokens, refill_rate in found
+                if tokens < 1
+            ]
+            if waits:
+                return False, max(waits)
+
+            for index, key_hash, tokens, _ in found:
+                SLOT.pack_into(buf, index * SLOT.size, key_hash, tokens - 1, now)
+        return True, 0
+
+    def reset(self):
+        with self._locked() as buf:
+            buf[:] = bytes(len(buf))
+
+
+bucket_store = SharedTokenBucketStore()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    bucket_store의 token bucket으로 클라이언트 IP별, 요청 본문의 email별 요청 수를 제한.
+    view의 throttle_scope에 key_type을 붙인 이름으로 AUTH_THROTTLE_RATES에서 제한을 찾고
+    (예: "login_ip": "20/min"), 없거나 키 값이 없으면 그 key_type은 제한하지 않는다.
+    모든 버킷에 토큰이 있을 때만 함께 사용하므로 IP 제한에 걸린 요청이 email 버킷을 줄이지 않는다.
+    """
+
+    key_types = ("ip", "email")
+
+    def __init__(self):
+        # 설정은 요청 시점에 읽음 (get_buckets)
+        pass
+
+    def get_key(self, request, key_type):
+        if key_type == "ip":
+            return self.get_ident(request)
+
+        # JSON 배열 등 객체가 아닌 본문은 제한하지 않고 시리얼라이저에서 400
+        if not isinstance(request.data, dict):
+            return None
+        email = request.data.get("email")
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return email.strip().lower()
+
+    def get_ident(self, request):
+        # 신뢰하는 프록시에서 온 요청만 REST_FRAMEWORK NUM_PROXIES 기준으로 X-Forwarded-For 사용
+        remote_addr = request.META.get("REMOTE_ADDR")
+        try:
+            address = ipaddress.ip_address(remote_addr)
+        except ValueError:
+            return remote_addr
+        for network in settings.AUTH_THROTTLE_TRUSTED_PROXIES:
+            if address in ipaddress.ip_network(network):
+                return super().get_ident(request)
+        return remote_addr
+
+    def get_buckets(self, request, view):
+        buckets = []
+        for key_type in self.key_types:
+            scope = f"{getattr(view, 'throttle_scope', None)}_{key_type}"
+            rate = settings.AUTH_THROTTLE_RATES.get(scope)
+            if rate is None:
+                continue
+            key = self.get_key(request, key_type)
+            if key is None:
+                continue
+            num_requests, duration = self.parse_rate(rate)
+            buckets.append((f"{scope}:{key}", num_requests, num_requests / duration))
+        return buckets
+
+    def allow_request(self, request, view):
+        buckets = self.get_buckets(request, view)
+        if not buckets:
+            return True
+
+        allowed, self.wait_seconds = bucket_store.consume(buckets)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
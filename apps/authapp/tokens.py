@@ -0,0 +1,220 @@
+from functools import cached_property
+
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test.signals import setting_changed
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from jwt import InvalidAlgorithmError, InvalidTokenError
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .blacklist_filter import blacklist_filter
+from .cache import jwks_cache
+from .models import IssuedToken, jti_to_bytes
+from .signals import token_blacklisted
+
+# 비대칭 서명에 사용할 수 있는 알고리즘 (키 파싱, JWK 변환용)
+SIGNING_ALGORITHMS = {
+    "RS256": RSAAlgorithm(RSAAlgorithm.SHA256),
+    "RS384": RSAAlgorithm(RSAAlgorithm.SHA384),
+    "RS512": RSAAlgorithm(RSAAlgorithm.SHA512),
+    "EdDSA": OKPAlgorithm(),
+}
+
+# access token이 어떤 refresh token에서 발급됐는지 (로그아웃 여부 확인용)
+REFRESH_JTI_CLAIM = "refresh_jti"
+# 토큰 발급 시점의 User.token_version (전체 로그아웃 여부 확인용)
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+class SigningKey:
+    def __init__(self, kid, algorithm, private_key, retired_at=None):
+        if algorithm not in SIGNING_ALGORITHMS:
+            raise ImproperlyConfigured(
+                f"Unsupported JWT signing algorithm: {algorithm}"
+            )
+
+        self.kid = kid
+        self.algorithm = algorithm
+        self.private_key = SIGNING_ALGORITHMS[algorithm].prepare_key(private_key)
+        self.public_key = self.private_key.public_key()
+        self.retired_at = parse_datetime(retired_at) if retired_at else None
+
+    def is_published(self, now):
+        # 교체된 키는 그 키로 서명된 토큰이 모두 만료될 때까지 공개
+        if self.retired_at is None:
+            return True
+        max_lifetime = max(
+            api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME
+        )
+        return now < self.retired_at + max_lifetime
+
+    def to_jwk(self):
+        jwk = SIGNING_ALGORITHMS[self.algorithm].to_jwk(self.public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """
+    settings.JWT_SIGNING_KEYS의 비대칭 키로 서명하고 kid 헤더로 검증 키를 고르는 백엔드.
+    키가 설정되지 않았거나 kid가 없는 기존 토큰은 SIMPLE_JWT 설정(HS256)으로 처리한다.
+    """
+
+    def __init__(self):
+        super().__init__(
+            api_settings.ALGORITHM,
+            api_settings.SIGNING_KEY,
+            api_settings.VERIFYING_KEY,
+            api_settings.AUDIENCE,
+            api_settings.ISSUER,
+            api_settings.JWK_URL,
+            api_settings.LEEWAY,
+            api_settings.JSON_ENCODER,
+        )
+
+    @cached_property
+    def keys(self):
+        return {
+            key.kid: key
+            for key in (SigningKey(**config) for config in settings.JWT_SIGNING_KEYS)
+        }
+
+    @property
+    def active_key(self):
+        # 교체되지 않은 첫 번째 키로 새 토큰 서명
+        for key in self.keys.values():
+            if key.retired_at is None:
+                return key
+        return None
+
+    def published_keys(self):
+        now = timezone.now()
+        return [key for key in self.keys.values() if key.is_published(now)]
+
+    def encode(self, payload):
+        key = self.active_key
+        if key is None:
+            return super().encode(payload)
+
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True):
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except InvalidTokenError as ex:
+            raise TokenBackendError(_("Token is invalid or expired")) from ex
+
+        if kid is None:
+            return super().decode(token, verify=verify)
+
+        key = self.keys.get(kid)
+        if key is None:
+            raise TokenBackendError(_("Token is invalid or expired"))
+
+        try:
+            return jwt.decode(
+                token,
+                key.public_key,
+                algorithms=[key.algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    "verify_aud": self.audience is not None,
+                    "verify_signature": verify,
+                },
+            )
+        except InvalidAlgorithmError as ex:
+            raise TokenBackendError(_("Invalid algorithm specified")) from ex
+        except InvalidTokenError as ex:
+            raise TokenBackendError(_("Token is invalid or expired")) from ex
+
+
+token_backend = KeyRingTokenBackend()
+
+
+def reload_signing_keys(*args, **kwargs):
+    if kwargs["setting"] == "JWT_SIGNING_KEYS":
+        token_backend.__dict__.pop("keys", None)
+        jwks_cache.clear()
+
+
+setting_changed.connect(reload_signing_keys)
+
+
+class OurAccessToken(AccessToken):
+    _token_backend = token_backend
+
+
+class OurRefreshToken(RefreshToken):
+    _token_backend = token_backend
+    access_token_class = OurAccessToken
+
+    @classmethod
+    def for_user(cls, user):
+        # BlacklistMixin.for_user는 토큰 원문을 OutstandingToken에 저장하므로 건너뛰고
+        # 블랙리스트 확인에 필요한 값만 IssuedToken에 저장
+        token = super(BlacklistMixin, cls).for_user(user)
+        IssuedToken.objects.create(
+            jti=jti_to_bytes(token[api_settings.JTI_CLAIM]),
+            user_id=user.pk,
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token["exp"]),
+        )
+
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+
+        # access token으로 복사되는 유저 클레임, certificate에서 User 조회 없이 응답
+        if settings.JWT_EMBED_USER_CLAIMS:
+            token["email"] = user.email
+            token["authorization"] = "admin" if user.is_staff else "general"
+            token[REFRESH_JTI_CLAIM] = token[api_settings.JTI_CLAIM]
+
+        return token
+
+    def check_blacklist(self):
+        # Bloom filter에 없는 jti는 DB 조회 없이 통과
+        if is_refresh_token_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        expires_at = datetime_from_epoch(self.payload["exp"])
+
+        if IssuedToken.blacklist(jti, user_id, expires_at):
+            token_blacklisted.send(
+                sender=self.__class__,
+                jti=jti,
+                user_id=user_id,
+                expires_at=expires_at,
+            )
+
+
+def is_refresh_token_blacklisted(jti):
+    return blacklist_filter.is_blacklisted(jti)
+
+
+def is_token_version_current(token, token_version):
+    # 클레임이 없는 기존 토큰은 버전 0으로 발급된 것으로 처리
+    return token.get(TOKEN_VERSION_CLAIM, 0) == token_version
@@ -2,15 +2,21 @@ from dj_rest_auth.registration.views import VerifyEmailView
 from django.urls import include, path, re_path
 
 from .views import (
+    AuthMetricsView,
     ConfirmEmailView,
     CustomRegisterView,
     CustomTokenRefreshView,
     GoogleLoginCallback,
+    LogoutAllView,
     OurLoginView,
     OurLogoutView,
     PasswordResetConfirmView,
     PasswordResetRequestView,
+    RevocationFeedView,
     UserAuthenticationView,
+    UserCertificateBatchView,
+    UserChangeFeedView,
+    UserLookupView,
     auth_redirect_view,
     email_confirm,
 )
@@ -22,8 +28,23 @@ urlpatterns = [
     path("social", include("allauth.urls")),
     path("login", OurLoginView.as_view(), name="login"),
     path("logout", OurLogoutView.as_view(), name="logout"),
+    path("logout/all", LogoutAllView.as_view(), name="logout-all"),
     # spring과의 인증 api
     path("certificate", UserAuthenticationView.as_view(), name="auth"),
+    # 여러 토큰을 한 번에 검증하는 spring 인증 api
+    path(
+        "certificate/batch",
+        UserCertificateBatchView.as_view(),
+        name="auth-batch",
+    ),
+    # 로그아웃/비활성화로 폐기된 토큰 이벤트 (서비스 간 api)
+    path("revocations", RevocationFeedView.as_view(), name="revocations"),
+    # 유저 생성/인증/변경 이벤트 (서비스 간 api)
+    path("users/changes", UserChangeFeedView.as_view(), name="user-changes"),
+    # 여러 유저의 email, 권한 일괄 조회 (서비스 간 api)
+    path("users/lookup", UserLookupView.as_view(), name="user-lookup"),
+    # 캐시 hit/miss 등 워커 단위 지표 (관리자 전용)
+    path("metrics", AuthMetricsView.as_view(), name="auth-metrics"),
     # 유효한 이메일이 유저에게 전달
     re_path(
         r"^account-confirm-email/$",
@@ -1,15 +1,33 @@
-import dns.resolver
-import requests
+import json
+from datetime import timedelta
+from itertools import chain
+
 import sentry_sdk
+from allauth.account import app_settings as allauth_account_settings
 from allauth.account.models import EmailAddress, EmailConfirmationHMAC
+from allauth.account.signals import user_signed_up
 from dj_rest_auth.registration.views import RegisterView
 from dj_rest_auth.views import LoginView, LogoutView, PasswordChangeView
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
-from django.http import HttpResponseRedirect, JsonResponse
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.http import (
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
+from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    set_response_etag,
+)
 from django.utils.encoding import force_bytes
 from django.utils.html import format_html
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
@@ -21,38 +39,62 @@ from drf_spectacular.utils import (
     extend_schema_serializer,
 )
 from rest_framework import status
-from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from config.utils import unauthorized_response
 
-from .models import User
+from .blacklist_filter import blacklist_filter
+from .cache import jwks_cache, token_cache, user_cache
+from .custom_auth import (
+    CachedJWTAuthentication,
+    get_certificate_max_age,
+    get_login_user,
+    get_token_user_fields,
+    get_user_fields,
+    has_user_claims,
+)
+from .email_domain import mx_cache
+from .google_auth import google_keys, verify_google_id_token
+from .hashing import password_hasher
+from .last_login import last_login_buffer
+from .mail import queue_lag
+from .models import RevocationEvent, User, UserChangeEvent
+from .permissions import IsInternalService
+from .profile_outbox import enqueue_profile_creation, outbox_lag
 from .serializers import (
+    CertificateBatchRequestSerializer,
+    CertificateBatchResponseSerializer,
     CustomLoginSerializer,
     CustomRegisterSerializer,
     JWTResponseSerializer,
+    RevocationFeedQuerySerializer,
+    RevocationFeedSerializer,
     UserCertificateSerializer,
+    UserChangeFeedQuerySerializer,
+    UserLookupRequestSerializer,
+    UserLookupResponseSerializer,
     UserSerializer,
 )
+from .throttling import TokenBucketThrottle
+from .tokens import OurRefreshToken, token_backend
 
 
 class CustomRegisterView(RegisterView):
     serializer_class = CustomRegisterSerializer
+    # 이메일 도메인 MX 조회, 비밀번호 해시, 확인 메일 발송 전에 요청 수 제한
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "signup"
 
     def is_valid_email_domain(self, email):
+        # 도메인의 MX 레코드가 존재하는지 확인 (워커 간 공유 캐시 사용)
         domain = email.split("@")[-1]
-        try:
-            # 도메인의 MX 레코드가 존재하는지 확인
-            dns.resolver.resolve(domain, "MX")
-            return True
-        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-            return False
+        return mx_cache.is_valid(domain)
 
     @extend_schema(
         tags=["User Registration"],
@@ -120,7 +162,7 @@ class CustomRegisterView(RegisterView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.get_serializer(data=request.data)
 
         try:
             if not serializer.is_valid():
@@ -141,8 +183,30 @@ class CustomRegisterView(RegisterView):
             sentry_sdk.capture_exception(e)
             raise e
 
-            # 성공 시의 응답 처리
-        return super().post(request, *args, **kwargs)
+        # 성공 시의 응답 처리 (RegisterView.create와 같지만 serializer를 다시 검증하지 않음)
+        user = self.perform_create(serializer)
+        return Response(
+            self.get_response_data(user),
+            status=status.HTTP_201_CREATED,
+            headers=self.get_success_headers(serializer.data),
+        )
+
+    def perform_create(self, serializer):
+        if (
+            allauth_account_settings.EMAIL_VERIFICATION
+            != allauth_account_settings.EmailVerificationMethod.MANDATORY
+        ):
+            return super().perform_create(serializer)
+
+        # 인증 전에는 로그인하지 않으므로 complete_signup의 로그인 단계
+        # (인증 여부 조회, 세션 저장) 없이 가입 신호와 확인 이메일만 처리
+        user = serializer.save(self.request)
+        request = self.request._request
+        user_signed_up.send(sender=user.__class__, request=request, user=user)
+        EmailAddress.objects.get_for_user(user, user.email).send_confirmation(
+            request, signup=True
+        )
+        return user
 
 
 @extend_schema(tags=["User Login"])
@@ -150,6 +214,9 @@ class CustomRegisterView(RegisterView):
 class OurLoginView(LoginView):
     permission_classes = (AllowAny,)
     serializer_class = CustomLoginSerializer
+    # 비밀번호 해시 계산 전에 요청 수 제한
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "login"
 
     def get_response(self):
         user_id = self.user.pk
@@ -163,6 +230,13 @@ class OurLoginView(LoginView):
         }
         return Response(data, status=status.HTTP_200_OK)
 
+    def login(self):
+        super().login()
+
+        # JWT 로그인은 세션 로그인(user_logged_in)을 거치지 않으므로 직접 기록
+        if settings.LAST_LOGIN_BUFFER:
+            last_login_buffer.add(self.user.pk)
+
     @extend_schema(
         responses={
             200: OpenApiResponse(
@@ -213,18 +287,33 @@ class OurLoginView(LoginView):
                 },
                 description="Email verification is required to log in.",
             ),
+            503: OpenApiResponse(
+                response={
+                    "type": "object",
+                    "properties": {
+                        "detail": {
+                            "type": "string",
+                            "example": (
+                                "요청이 많아 로그인을 처리할 수 없습니다. "
+                                "잠시 후 다시 시도해 주세요."
+                            ),
+                        }
+                    },
+                },
+                description="Password hashing executor is saturated.",
+            ),
         },
     )
     def post(self, request, *args, **kwargs):
         self.request = request
 
+        # 유저와 이메일 인증 여부를 한 번에 조회 (시리얼라이저, 인증 백엔드에서 재사용)
+        # 객체가 아닌 본문은 조회하지 않고 시리얼라이저에서 400
+        email = request.data.get("email") if isinstance(request.data, dict) else None
+        user = get_login_user(request, email)
+
         # admin 계정이 아니고, 인증 메일 확인하기 전이면 403
-        if (
-            not self.request.user.is_superuser
-            and EmailAddress.objects.filter(
-                email=request.data["email"], verified=False
-            ).exists()
-        ):
+        if user is not None and not user.is_superuser and user.email_unverified:
             # Sentry에 메시지를 전송하여 인증되지 않은 이메일 접근을 기록
             sentry_sdk.capture_message(
                 f"Unauthorized access attempt with unverified email: {request.data['email']}"
@@ -309,7 +398,7 @@ class OurLogoutView(LogoutView):
 
         # RefreshToken을 블랙리스트에 추가하여 무효화
         try:
-            token = RefreshToken(refresh_token)
+            token = OurRefreshToken(refresh_token)
             token.blacklist()
 
             # 로그아웃 성공 응답
@@ -331,12 +420,57 @@ class OurLogoutView(LogoutView):
             )
 
 
+class LogoutAllView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        tags=["User Logout"],
+        description="""Revoke every access and refresh token issued to the user.
+        Other server processes keep accepting old tokens for up to
+        revocation_delay seconds (AUTH_USER_CACHE_TTL, or the access token
+        lifetime when JWT_EMBED_USER_CLAIMS is on).""",
+        request=None,
+        responses={
+            200: OpenApiResponse(
+                response={
+                    "type": "object",
+                    "properties": {
+                        "detail": {
+                            "type": "string",
+                            "example": "모든 기기에서 로그아웃되었습니다.",
+                        },
+                        "revocation_delay": {"type": "integer", "example": 60},
+                    },
+                },
+                description="Logout Success",
+            ),
+        },
+    )
+    def post(self, request):
+        # 토큰마다 블랙리스트에 추가하지 않고 token_version만 증가
+        request.user.revoke_tokens()
+        return Response(
+            {
+                "detail": _("Successfully logged out from all devices."),
+                "revocation_delay": self.get_revocation_delay(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def get_revocation_delay(self):
+        # 다른 워커는 유저 캐시가 만료된 뒤 (클레임 모드는 access token 만료 후) 반영
+        delay = settings.AUTH_USER_CACHE_TTL
+        if settings.JWT_EMBED_USER_CLAIMS:
+            delay = max(delay, api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+        return int(delay)
+
+
 @login_required
 def auth_redirect_view(request):
     user = request.user
 
     # JWT 토큰 생성
-    refresh = RefreshToken.for_user(user)
+    refresh = OurRefreshToken.for_user(user)
     access_token = str(refresh.access_token)
     refresh_token = str(refresh)
 
@@ -349,7 +483,8 @@ def auth_redirect_view(request):
 
 
 class UserAuthenticationView(APIView):
-    authentication_classes = [JWTAuthentication]
+    # 매 요청마다 User 테이블을 조회하지 않도록 캐시를 거치는 인증 클래스 사용
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
@@ -399,7 +534,325 @@ class UserAuthenticationView(APIView):
             "authentication": True,
             "authorization": authorization_status,
         }
-        return JsonResponse(response_data)
+        response = JsonResponse(response_data)
+
+        # 응답은 토큰에 의해서만 결정되므로 토큰 만료 전까지 짧게 캐시 허용
+        # 로그아웃 후에도 캐시된 응답이 쓰일 수 있는 시간은 AUTH_CERTIFICATE_MAX_AGE로 제한
+        patch_cache_control(
+            response, private=True, max_age=get_certificate_max_age(token)
+        )
+        patch_vary_headers(response, ["Authorization"])
+        set_response_etag(response)
+
+        return get_conditional_response(
+            request, etag=response["ETag"], response=response
+        )
+
+
+class UserCertificateBatchView(APIView):
+    # 토큰은 요청 본문으로 전달되므로 헤더 인증은 사용하지 않음
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    invalid_result = {
+        "error": "Invalid token or user not found",
+        "authentication": False,
+        "authorization": "",
+    }
+
+    def get_validated_token(self, authenticator, raw_token):
+        # "Bearer <token>" 형태와 토큰 값만 전달하는 형태 모두 허용
+        raw_token = raw_token.split()[-1].encode()
+        try:
+            validated_token = authenticator.get_validated_token(raw_token)
+        except InvalidToken:
+            return None
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return None
+        return validated_token
+
+    @extend_schema(
+        tags=["User Authenticate"],
+        description="Spring server can validate many tokens in one request.",
+        request=CertificateBatchRequestSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=CertificateBatchResponseSerializer,
+                description="""One certificate per token in request order.
+                Invalid tokens have authentication false with error.""",
+            ),
+        },
+    )
+    def post(self, request):
+        serializer = CertificateBatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        authenticator = CachedJWTAuthentication()
+        validated_tokens = [
+            self.get_validated_token(authenticator, raw_token)
+            for raw_token in serializer.validated_data["tokens"]
+        ]
+
+        # 클레임이 없는 토큰의 유저를 한 번에 조회 (캐시에 없는 유저만 id__in 쿼리)
+        users = get_user_fields(
+            [
+                token[api_settings.USER_ID_CLAIM]
+                for token in validated_tokens
+                if token is not None and not has_user_claims(token)
+            ]
+        )
+
+        results = []
+        for token in validated_tokens:
+            # certificate와 같은 검사 (클레임 모드의 블랙리스트, 비활성, 전체 로그아웃)
+            fields = None
+            if token is not None:
+                try:
+                    fields = get_token_user_fields(token, users)
+                except AuthenticationFailed:
+                    pass
+            if fields is None:
+                results.append(self.invalid_result)
+                continue
+
+            results.append(
+                {
+                    "user_id": fields["id"],
+                    "email": fields["email"],
+                    "authentication": True,
+                    "authorization": "admin" if fields["is_staff"] else "general",
+                }
+            )
+
+        return JsonResponse({"results": results})
+
+
+def settled_feed_window():
+    """다시 보낼 이벤트의 시작 시각과 노출할 이벤트의 마지막 시각"""
+    settled_at = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_DELAY)
+    return settled_at - timedelta(seconds=settings.CHANGE_FEED_OVERLAP), settled_at
+
+
+class RevocationFeedView(APIView):
+    # 유저 JWT가 아닌 서비스 토큰으로 호출
+    authentication_classes = []
+    permission_classes = [IsInternalService]
+
+    @extend_schema(
+        tags=["User Authenticate"],
+        description="""Revoked tokens and users whose tokens were all revoked
+        in seq order. Pass the returned next value as since to read new events.
+        Events committed late are sent again even if their seq is not above since,
+        so apply events idempotently by seq.""",
+        parameters=[RevocationFeedQuerySerializer],
+        responses={200: RevocationFeedSerializer},
+    )
+    def get(self, request):
+        query = RevocationFeedQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since = query.validated_data["since"]
+        limit = query.validated_data["limit"]
+
+        # 아직 커밋되지 않은 앞 번호 이벤트가 건너뛰어지지 않도록 최근 이벤트는 제외
+        overlap_from, settled_at = settled_feed_window()
+        rows = (
+            RevocationEvent.objects.filter(created_at__lte=settled_at)
+            .order_by("seq")
+            .values("seq", "kind", "user_id", "jti", "expires_at", "created_at")
+        )
+        # 늦게 커밋되어 since 이하의 seq로 나타난 이벤트를 위해 최근 이벤트는 다시 보냄
+        resent = (
+            list(rows.filter(seq__lte=since, created_at__gt=overlap_from))
+            if since
+            else []
+        )
+        events = list(rows.filter(seq__gt=since)[:limit])
+
+        return Response(
+            {
+                "events": resent + events,
+                "next": events[-1]["seq"] if events else since,
+                "has_more": len(events) == limit,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class UserChangeFeedView(APIView):
+    # 유저 JWT가 아닌 서비스 토큰으로 호출
+    authentication_classes = []
+    permission_classes = [IsInternalService]
+
+    columns = ["seq", "user_id", "kind", "email", "is_active"]
+    chunk_size = 1000
+
+    @extend_schema(
+        tags=["User Authenticate"],
+        description="""User changes in seq order.
+        Kinds: created, verified, email_changed, deactivated, activated.
+        Rows follow columns order.
+        Pass the returned next value as after to read new changes.
+        Changes committed late are sent again even if their seq is not above after,
+        so apply changes idempotently by seq.""",
+        parameters=[UserChangeFeedQuerySerializer],
+        responses={
+            200: OpenApiResponse(
+                response={
+                    "type": "object",
+                    "properties": {
+                        "columns": {"type": "array", "items": {"type": "string"}},
+                        "changes": {"type": "array", "items": {"type": "array"}},
+                        "next": {"type": "integer"},
+                        "has_more": {"type": "boolean"},
+                    },
+                },
+                examples=[
+                    OpenApiExample(
+                        name="User changes",
+                        value={
+                            "columns": ["seq", "user_id", "kind", "email", "is_active"],
+                            "changes": [[1, 3, "created", "user@naver.com", True]],
+                            "next": 1,
+                            "has_more": False,
+                        },
+                    )
+                ],
+            ),
+        },
+    )
+    def get(self, request):
+        query = UserChangeFeedQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        after = query.validated_data["after"]
+        limit = query.validated_data["limit"]
+
+        # 아직 커밋되지 않은 앞 번호 이벤트가 건너뛰어지지 않도록 최근 이벤트는 제외
+        overlap_from, settled_at = settled_feed_window()
+        rows = (
+            UserChangeEvent.objects.filter(created_at__lte=settled_at)
+            .order_by("seq")
+            .values_list(*self.columns)
+        )
+        # 늦게 커밋되어 after 이하의 seq로 나타난 변경을 위해 최근 변경은 다시 보냄
+        resent = (
+            rows.filter(seq__lte=after, created_at__gt=overlap_from)
+            if after
+            else rows.none()
+        )
+
+        return StreamingHttpResponse(
+            self.stream(resent, rows.filter(seq__gt=after)[:limit], after, limit),
+            content_type="application/json",
+        )
+
+    def stream(self, resent, rows, after, limit):
+        # 전체 결과를 메모리에 올리지 않고 chunk 단위로 JSON 배열 작성
+        yield '{"columns":%s,"changes":[' % json.dumps(
+            self.columns, separators=(",", ":")
+        )
+
+        last_seq = after
+        count = 0
+        chunk = []
+        separator = ""
+        for row in chain(
+            resent.iterator(chunk_size=self.chunk_size),
+            rows.iterator(chunk_size=self.chunk_size),
+        ):
+            chunk.append(json.dumps(row, separators=(",", ":")))
+            # 다시 보낸 변경은 커서와 개수에 포함하지 않음
+            if row[0] > after:
+                last_seq = row[0]
+                count += 1
+            if len(chunk) == self.chunk_size:
+                yield separator + ",".join(chunk)
+                chunk = []
+                separator = ","
+        if chunk:
+            yield separator + ",".join(chunk)
+
+        yield '],"next":%d,"has_more":%s}' % (
+            last_seq,
+            "true" if count == limit else "false",
+        )
+
+
+class UserLookupView(APIView):
+    # 유저 JWT가 아닌 서비스 토큰으로 호출
+    authentication_classes = []
+    permission_classes = [IsInternalService]
+
+    @extend_schema(
+        tags=["User Authenticate"],
+        description="""Spring server can look up email and authorization
+        of many users at once.""",
+        request=UserLookupRequestSerializer,
+        responses={200: UserLookupResponseSerializer},
+    )
+    def post(self, request):
+        serializer = UserLookupRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        # 요청한 유저 전체를 values() 쿼리 한 번으로 조회
+        rows = User.objects.filter(id__in=ids).values_list(
+            "id", "email", "is_staff", "is_active"
+        )
+
+        data = {
+            "user_id": [],
+            "email": [],
+            "authorization": [],
+            "is_active": [],
+        }
+        for user_id, email, is_staff, is_active in rows:
+            data["user_id"].append(user_id)
+            data["email"].append(email)
+            data["authorization"].append("admin" if is_staff else "general")
+            data["is_active"].append(is_active)
+
+        found = set(data["user_id"])
+        data["not_found"] = [user_id for user_id in ids if user_id not in found]
+
+        return JsonResponse(data)
+
+
+class AuthMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["Auth Metrics"],
+        description="""요청을 처리한 워커 프로세스의 통계 (관리자 전용)
+        캐시, 블랙리스트 필터, last_login 버퍼, 비밀번호 해시 실행기,
+        MX 조회 캐시, 구글 공개키 캐시 통계와
+        spring 프로필 outbox, 메일 발송 대기 현황""",
+    )
+    def get(self, request):
+        data = {
+            "user_cache": user_cache.stats(),
+            "token_cache": token_cache.stats(),
+            "blacklist_filter": blacklist_filter.stats(),
+            "last_login_buffer": last_login_buffer.stats(),
+            "password_hasher": password_hasher.stats(),
+            "mx_cache": mx_cache.stats(),
+            "google_keys": google_keys.stats(),
+            "profile_outbox": outbox_lag(),
+            "email_queue": queue_lag(),
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def jwks_view(request):
+    # spring 등 다른 서비스가 토큰을 직접 검증할 수 있도록 공개키 목록 제공
+    body = jwks_cache.get("jwks")
+    if body is None:
+        keys = [key.to_jwk() for key in token_backend.published_keys()]
+        body = json.dumps({"keys": keys})
+        jwks_cache.set("jwks", body)
+
+    response = HttpResponse(body, content_type="application/json")
+    response["Cache-Control"] = f"public, max-age={settings.JWKS_CACHE_MAX_AGE}"
+    return response
 
 
 def email_confirm(request):
@@ -420,21 +873,10 @@ class ConfirmEmailView(APIView):
         if confirmation is None:
             return HttpResponseRedirect(redirect_to="/auth/email-confirm")
 
-        confirmation.confirm(self.request)
-
-        # 이메일 인증이 완료된 후 spring 프로필 생성하는 API 요청
-        url = "http://13.125.137.216:8080/profiles"
-        data = {
-            "id": confirmation.email_address.user.id,
-        }
-        response = requests.post(url, json=data)
-
-        # spring 프로필 생성 api 응답 코드가 200 또는 201이 아닐 때 Sentry에 메시지를 전송
-        if response.status_code not in [200, 201]:
-            sentry_sdk.capture_message(
-                f"Failed to create profile in Spring server. "
-                f"Status code: {response.status_code}, Response: {response.text}"
-            )
+        # 이메일 인증과 spring 프로필 생성 요청(outbox)을 같은 트랜잭션에 저장
+        with transaction.atomic():
+            if confirmation.confirm(self.request) is not None:
+                enqueue_profile_creation(confirmation.email_address.user_id)
 
         return HttpResponseRedirect(redirect_to="/auth/email-confirm")
 
@@ -515,66 +957,56 @@ class CustomTokenRefreshView(TokenRefreshView):
 
 
 class GoogleLoginCallback(APIView):
-    def send_profile_creation_request(self, user_id):
-        # 유저 db에 등록된 이후에 프로필 생성하는 spring api 요청
-        url = "http://13.125.137.216:8080/profiles"
-        data = {"id": user_id}
-        response = requests.post(url, json=data)
-
-        # spring 프로필 생성 api 응답 코드가 200 또는 201이 아닐 때 Sentry에 메시지를 전송
-        if response.status_code not in [200, 201]:
-            sentry_sdk.capture_message(
-                f"Failed to create profile in Spring server. "
-                f"Status code: {response.status_code}, Response: {response.text}"
-            )
-
     def verify_google_token(self, id_token):
-        # Google의 토큰 검증 엔드포인트
-        google_token_info_url = (
-            f"https://oauth2.googleapis.com/tokeninfo?id_token={id_token}"
-        )
-
-        # Google에 토큰 유효성 확인 요청
-        response = requests.get(google_token_info_url)
-
-        if response.status_code == 200:
-            token_info = response.json()
-            email = token_info.get("email")
-            if token_info.get("email_verified"):
-                return email, token_info
-            else:
-                raise ValueError("이메일이 인증되지 않았습니다.")
+        # Google 공개키(캐시)로 서명, 발급자, 대상, 만료를 직접 검증
+        token_info = verify_google_id_token(id_token)
+        email = token_info.get("email")
+        if token_info.get("email_verified") is True:
+            return email, token_info
         else:
-            raise ValueError("토큰이 유효하지 않습니다.")
+            raise ValueError("이메일이 인증되지 않았습니다.")
 
     def create_or_update_user(self, email, token_info):
-        try:
-            # 이미 등록된 사용자가 있는지 확인
-            user = User.objects.get(email=email)
-            # 사용자가 존재하지만 이메일 인증이 완료되지 않았을 경우 구글 로그인으로 이메일 인증 처리
-            email_address = EmailAddress.objects.get(user=user, email=email)
-            if not email_address.verified:
-                email_address.verified = True
-                email_address.save()
-
-                self.send_profile_creation_request(user.id)
+        # 이미 등록된 사용자와 인증되지 않은 이메일 주소를 한 번에 조회
+        user = (
+            User.objects.filter(email=email)
+            .annotate(
+                unverified_email_id=Subquery(
+                    EmailAddress.objects.filter(
+                        user=OuterRef("pk"), email=email, verified=False
+                    ).values("pk")[:1]
+                )
+            )
+            .first()
+        )
 
-        except User.DoesNotExist:
+        if user is not None:
+            # 사용자가 존재하지만 이메일 인증이 완료되지 않았을 경우 구글 로그인으로 이메일 인증 처리
+            if user.unverified_email_id is not None:
+                # 이메일 인증과 spring 프로필 생성 요청(outbox)을 같은 트랜잭션에 저장
+                with transaction.atomic():
+                    email_address = EmailAddress.objects.get(
+                        pk=user.unverified_email_id
+                    )
+                    email_address.verified = True
+                    email_address.save()
+                    enqueue_profile_creation(user.id)
+        else:
             # 새로운 사용자 생성
-            user = User.objects.create(
+            user = User(
                 email=email,
                 first_name=token_info.get("given_name", ""),
                 last_name=token_info.get("family_name", ""),
             )
             user.set_unusable_password()  # 소셜 로그인은 비밀번호가 필요 없음
-            user.save()
-
-            self.send_profile_creation_request(user.id)
+            with transaction.atomic():
+                user.save()
+                enqueue_profile_creation(user.id)
 
         return user
 
     def get_user_info(self, user):
-        refresh = RefreshToken.for_user(user)
+        refresh = OurRefreshToken.for_user(user)
         return {
             "access": str(refresh.access_token),
             "refresh": str(refresh),
@@ -646,6 +1078,10 @@ class GoogleLoginCallback(APIView):
 
 
 class PasswordResetRequestView(APIView):
+    # 재설정 메일 발송 전에 요청 수 제한
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "password_reset"
+
     @extend_schema(
         tags=["Password Reset Email Request"],
         description="User can require password reset email without login.",
@@ -796,6 +1232,8 @@ class PasswordResetConfirmView(PasswordChangeView):
             # 비밀번호 변경
             user.set_password(serializer.validated_data["new_password1"])
             user.save()
+            # 이전 비밀번호로 발급된 모든 토큰 무효화
+            user.revoke_tokens()
             return Response(status=status.HTTP_200_OK)
         # 필수 항목이 누락된 경우 에러 메시지 커스터마이즈
         error_list = []
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
     "rest_framework_simplejwt",
+    # 기존 토큰 정리용, 새로 발급되는 토큰은 authapp.IssuedToken에 저장
     "rest_framework_simplejwt.token_blacklist",
     "dj_rest_auth",
     "dj_rest_auth.registration",
@@ -97,6 +98,16 @@ EMAIL_PORT = "587"
 
 EMAIL_USE_TLS = True
 
+# EMAIL_BACKEND를 "apps.authapp.mail.QueuedEmailBackend"로 설정하면
+# 메일을 queued_email 테이블에 저장만 하고 send_queued_email 커맨드가
+# 아래 백엔드로 발송 (SMTP 연결 재사용, 분당 발송 수 제한)
+QUEUED_EMAIL_DELIVERY_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+QUEUED_EMAIL_RATE_PER_MINUTE = 60
+# 발송 실패 시 재시도 간격 (BASE_BACKOFF초부터 두 배씩, 최대 MAX_BACKOFF초), MAX_ATTEMPTS번 실패하면 버림
+QUEUED_EMAIL_BASE_BACKOFF = 10
+QUEUED_EMAIL_MAX_BACKOFF = 60 * 10
+QUEUED_EMAIL_MAX_ATTEMPTS = 10
+
 
 ACCOUNT_CONFIRM_EMAIL_ON_GET = True  # 유저가 링크 클릭 시 회원가입 완료
 ACCOUNT_USER_MODEL_USERNAME_FIELD = None
@@ -134,7 +145,7 @@ TEMPLATES = [
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         # "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",  # JWT 인증 클래스 우선
+        "apps.authapp.custom_auth.VersionedJWTAuthentication",  # JWT 인증 클래스 우선
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     # "EXCEPTION_HANDLER": "config.utils.custom_exception_handler",
@@ -148,6 +159,9 @@ REST_AUTH = {
     # "JWT_AUTH_REFRESH_COOKIE": "refresh_token",
     # "JWT_AUTH_HTTPONLY": True,
     "SESSION_LOGIN": False,
+    "JWT_TOKEN_CLAIMS_SERIALIZER": (
+        "apps.authapp.serializers.OurTokenObtainPairSerializer"
+    ),
 }
 
 
@@ -162,7 +176,152 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     # "AUTH_COOKIE_HTTP_ONLY": True,  # 클라이언트 자바스크립트에서 접근 불가
     "AUTH_COOKIE_PATH": "/",  # 쿠키의 유효 경로
+    # 토큰 서명/검증은 apps.authapp.tokens의 키링 백엔드를 거침
+    "AUTH_TOKEN_CLASSES": ("apps.authapp.tokens.OurAccessToken",),
+    "TOKEN_REFRESH_SERIALIZER": "apps.authapp.serializers.OurTokenRefreshSerializer",
+}
+
+# JWT 비대칭 서명 키 (RS256/RS384/RS512/EdDSA), 비어 있으면 SECRET_KEY로 HS256 서명
+# 교체되지 않은(retired_at 없는) 첫 번째 키로 서명하고 토큰 헤더에 kid를 넣는다
+# 교체된 키는 retired_at 이후 토큰 유효기간 동안 검증과 JWKS 공개에만 사용
+# 예: {"kid": "2024-10", "algorithm": "RS256", "private_key": "<PEM>",
+#      "retired_at": None}
+JWT_SIGNING_KEYS = []
+JWKS_CACHE_MAX_AGE = 300  # 초, /.well-known/jwks.json 캐시 시간
+
+# 토큰 발급 시 email, authorization 클레임을 넣어 certificate가 User 조회 없이 응답
+# 권한 변경은 다음 로그인 때 반영되고, 로그아웃 여부는 블랙리스트로 확인
+JWT_EMBED_USER_CLAIMS = False
+# 클레임 모드에서 비활성화/전체 로그아웃은 access token 만료까지 늦게 반영될 수 있으므로
+# ACCESS_TOKEN_LIFETIME이 이 값보다 길면 시스템 체크 오류 (authapp.E001)
+JWT_EMBED_USER_CLAIMS_MAX_ACCESS_LIFETIME = timedelta(minutes=5)
+
+# /auth/certificate 유저 캐시 (gunicorn 워커 프로세스 단위)
+AUTH_USER_CACHE_MAX_SIZE = 10000  # 캐시할 최대 유저 수
+# 초, 다른 워커에서 변경된 정보(전체 로그아웃 포함)가 반영되기까지의 최대 지연
+AUTH_USER_CACHE_TTL = 60
+AUTH_TOKEN_CACHE_MAX_SIZE = 10000  # 검증 결과를 캐시할 최대 access token 수
+# /auth/certificate 응답 Cache-Control max-age 상한 (초), 로그아웃 반영 지연의 최대값
+# 0이면 클라이언트 캐시를 사용하지 않음
+AUTH_CERTIFICATE_MAX_AGE = 30
+# 설정하면 이 경로의 GET 요청을 WSGI 단에서 바로 처리 (미들웨어, DRF 생략)
+# 예: "/auth/certificate", None이면 기존 UserAuthenticationView로 처리
+AUTH_CERTIFICATE_FAST_PATH = None
+# /auth/certificate/batch 한 번에 검증할 최대 토큰 수
+AUTH_CERTIFICATE_BATCH_MAX_SIZE = 500
+
+# 서비스 간 내부 api 호출용 토큰 (X-Service-Token 헤더), 교체 시 새 토큰을 먼저 추가
+INTERNAL_SERVICE_TOKENS = []
+
+# POST /auth/users/lookup 한 번에 조회할 최대 유저 수
+USER_LOOKUP_MAX_SIZE = 5000
+
+# GET /auth/revocations, /auth/users/changes 한 번에 반환할 최대 이벤트 수
+REVOCATION_FEED_MAX_LIMIT = 1000
+USER_CHANGE_FEED_MAX_LIMIT = 10000
+# seq는 INSERT 시점에 정해지므로 트랜잭션이 늦게 커밋되면 소비자가 이미 지나간 seq로 나타날 수 있음
+# 최근 이벤트는 CHANGE_FEED_DELAY 뒤에 노출하고, 그 전 CHANGE_FEED_OVERLAP 동안 노출된 이벤트는
+# since/after 이하의 seq여도 다시 보냄 (초, 소비자는 seq로 중복 제거)
+# 커밋이 DELAY + OVERLAP보다 늦거나 소비자의 조회 간격이 OVERLAP보다 길면 누락될 수 있음
+CHANGE_FEED_DELAY = 2
+CHANGE_FEED_OVERLAP = 300
+
+# refresh token 블랙리스트 Bloom filter (예상 블랙리스트 수, 목표 오탐률)
+BLACKLIST_FILTER_CAPACITY = 1000000
+BLACKLIST_FILTER_ERROR_RATE = 0.001
+# 다른 워커에서 추가된 블랙리스트를 가져오는 주기, 늦게 커밋된 행을 위한 여유 시간 (초)
+BLACKLIST_FILTER_SYNC_INTERVAL = 1
+BLACKLIST_FILTER_SYNC_MARGIN = 5
+
+# 로그인할 때마다 last_login을 UPDATE하지 않고 프로세스 메모리에 모아서 한 번에 저장
+# LAST_LOGIN_FLUSH_SIZE명이 모이거나 LAST_LOGIN_FLUSH_INTERVAL초가 지나면 저장
+LAST_LOGIN_BUFFER = False
+LAST_LOGIN_FLUSH_INTERVAL = 30
+LAST_LOGIN_FLUSH_SIZE = 500
+
+# 로그인 비밀번호 해시 계산을 워커당 스레드 풀에서 실행 (0이면 요청 스레드에서 바로 실행)
+# 실행 중 + 대기 작업이 WORKERS + QUEUE_SIZE를 넘거나 DEADLINE(초)을 넘기면 503
+PASSWORD_HASH_WORKERS = 0
+PASSWORD_HASH_QUEUE_SIZE = 4
+PASSWORD_HASH_DEADLINE = 2
+# 서버 전체(모든 gunicorn 워커)에서 동시에 계산할 수 있는 해시 수, 넘으면 503 (0이면 제한 없음)
+# sync 워커는 프로세스당 요청을 하나씩 처리하므로 위 스레드 풀 제한만으로는 걸리지 않음
+# sync 워커 5개(Dockerfile) 중 하나는 해시 계산 없는 요청을 처리할 수 있도록 4
+PASSWORD_HASH_MAX_CONCURRENT = 4
+PASSWORD_HASH_SLOTS_PATH = os.environ.get(
+    "PASSWORD_HASH_SLOTS_PATH", "/tmp/ourjourney-password-hash"
+)
+
+# 회원가입 이메일 도메인 MX 조회 결과는 워커끼리 공유하는 파일 캐시에 저장
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "email_domains": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "EMAIL_DOMAIN_CACHE_DIR", "/tmp/ourjourney-email-domains"
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
 }
+# MX 조회 제한 시간, MX 레코드 TTL 상한, 없는 도메인 결과 캐시 시간 (초)
+MX_LOOKUP_TIMEOUT = 2
+MX_CACHE_MAX_TTL = 60 * 60 * 24
+MX_CACHE_NEGATIVE_TTL = 60 * 5
+# 조회하지 않고 바로 유효로 처리하는 가입자가 많은 도메인
+MX_PRELOADED_DOMAINS = frozenset(
+    [
+        "gmail.com",
+        "naver.com",
+        "daum.net",
+        "hanmail.net",
+        "kakao.com",
+        "nate.com",
+        "icloud.com",
+        "outlook.com",
+        "hotmail.com",
+        "yahoo.com",
+    ]
+)
+
+# 구글 로그인 ID token 검증 (aud로 허용할 OAuth 클라이언트 ID 목록은 환경별 설정에서 지정)
+GOOGLE_ID_TOKEN_AUDIENCES = []
+GOOGLE_ID_TOKEN_LEEWAY = 30
+# 구글 공개키 요청 제한 시간, 모르는 kid로 공개키를 다시 가져오는 최소 간격 (초)
+GOOGLE_JWKS_TIMEOUT = 3
+GOOGLE_JWKS_MIN_REFRESH_INTERVAL = 60
+
+# spring 프로필 생성 api, 요청 제한 시간 (초)
+PROFILE_SERVICE_URL = os.environ.get(
+    "PROFILE_SERVICE_URL", "http://13.125.137.216:8080/profiles"
+)
+PROFILE_SERVICE_TIMEOUT = 5
+# dispatch_profile_outbox 재시도 간격 (BASE_BACKOFF초부터 두 배씩, 최대 MAX_BACKOFF초)
+# ALERT_ATTEMPTS번 연속 실패한 요청은 Sentry로 알림
+PROFILE_OUTBOX_BASE_BACKOFF = 5
+PROFILE_OUTBOX_MAX_BACKOFF = 60 * 60
+PROFILE_OUTBOX_ALERT_ATTEMPTS = 5
+
+# 로그인/회원가입/비밀번호 재설정 요청 수 제한
+# token bucket 방식으로 "요청 수/기간"만큼 연속 요청 가능
+# 키는 "{view throttle_scope}_{ip|email}"
+# 한 서버의 워커들이 아래 파일을 mmap으로 공유
+AUTH_THROTTLE_RATES = {
+    "login_ip": "30/min",
+    "login_email": "10/min",
+    "signup_ip": "20/hour",
+    "signup_email": "5/hour",
+    "password_reset_ip": "10/hour",
+    "password_reset_email": "3/hour",
+}
+AUTH_THROTTLE_STORE_PATH = os.environ.get(
+    "AUTH_THROTTLE_STORE_PATH", "/tmp/ourjourney-throttle"
+)
+AUTH_THROTTLE_STORE_SLOTS = 65536
+# X-Forwarded-For를 믿을 프록시 주소 대역 (예: "172.16.0.0/12")
+# 다른 주소에서 온 요청은 X-Forwarded-For를 무시하고 REMOTE_ADDR로 제한
+AUTH_THROTTLE_TRUSTED_PROXIES = []
 
 sentry_sdk.init(
     dsn="https://153978f09ca2a454959514196326bb34@o4508064670154752.ingest.us.sentry.io/4508064673955840",
@@ -207,6 +366,21 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# 첫 번째 해셔로 새 비밀번호를 저장하고, 다른 해셔/파라미터로 저장된 비밀번호는
+# 다음 로그인 때 첫 번째 해셔로 다시 저장 (Argon2id로 바꾸려면 순서 변경 + argon2-cffi 설치)
+PASSWORD_HASHERS = [
+    "apps.authapp.hashers.TunedPBKDF2PasswordHasher",
+    "apps.authapp.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# 해셔별 비용 파라미터, 값은 manage.py benchmark_password_hashers 결과 참고
+# 예: {"pbkdf2_sha256": {"iterations": 600000}, "argon2": {"time_cost": 3}}
+# 값을 바꾸거나 Argon2로 바꾸면 기존 해시가 모두 재해시 대상이 되어, 배포 직후 로그인마다
+# 해시를 두 번 계산하므로 PASSWORD_HASH_MAX_CONCURRENT 여유를 확인하고 배포
+PASSWORD_HASHER_PARAMS = {}
+
 S3_URI = "https://spoon-ourjourney.s3.ap-northeast-2.amazonaws.com"
 
 # Internationalization
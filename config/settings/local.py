@@ -48,9 +48,24 @@ DATABASES = {
 
 CLIENT_ID = env("CLIENT_ID")
 GOOGLE_SECRET = env("GOOGLE_SECRET")
+GOOGLE_ID_TOKEN_AUDIENCES = env.list("GOOGLE_ID_TOKEN_AUDIENCES", default=[CLIENT_ID])
 EMAIL_HOST_USER = env("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+EMAIL_BACKEND = env("EMAIL_BACKEND", default=EMAIL_BACKEND)
+
+# JSON 배열 형태로 전달 (base.py의 JWT_SIGNING_KEYS 설명 참고)
+JWT_SIGNING_KEYS = env.json("JWT_SIGNING_KEYS", default=[])
+
+# nginx가 X-Forwarded-For 마지막에 추가한 주소를 클라이언트 IP로 사용 (요청 수 제한 키)
+REST_FRAMEWORK = {**REST_FRAMEWORK, "NUM_PROXIES": 1}
+# docker 네트워크의 nginx에서 온 요청만 X-Forwarded-For를 사용 (8000 포트로 직접 온 요청은 무시)
+AUTH_THROTTLE_TRUSTED_PROXIES = env.list(
+    "AUTH_THROTTLE_TRUSTED_PROXIES", default=["172.16.0.0/12"]
+)
+
+# 쉼표로 구분된 서비스 간 호출 토큰 목록
+INTERNAL_SERVICE_TOKENS = env.list("INTERNAL_SERVICE_TOKENS", default=[])
 
 S3_BUCKET_NAME = env("S3_BUCKET_NAME")
 S3_ACCESS_KEY = env("S3_ACCESS_KEY")
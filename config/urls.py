@@ -24,6 +24,7 @@ from drf_spectacular.views import (
     SpectacularYAMLAPIView,
 )
 
+from apps.authapp.views import jwks_view
 from config.views import HealthCheckView
 
 urlpatterns = [
@@ -43,4 +44,6 @@ urlpatterns = [
         name="redoc",
     ),
     path("health", HealthCheckView.as_view(), name="health-check"),
+    # JWT 서명 검증용 공개키 (JWKS)
+    path(".well-known/jwks.json", jwks_view, name="jwks"),
 ]
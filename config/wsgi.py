@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# spring 인증 요청(/auth/certificate)은 미들웨어를 거치지 않는 경량 경로로 처리
+if settings.AUTH_CERTIFICATE_FAST_PATH:
+    from apps.authapp.fast_certificate import CertificateFastPathApp
+
+    application = CertificateFastPathApp(application)